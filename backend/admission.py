@@ -0,0 +1,144 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+# Pahalı endpoint'ler için giriş kontrolü
+# - İstemci (IP) ve rota sınıfı bazında token bucket hız limiti
+# - Süreç genelinde aynı anda çalışan render ve upstream çağrısı sınırı
+# Limit aşıldığında istek işlenmeden reddedilir (429 + Retry-After)
+
+
+# İstek kabul edilmediğinde fırlatılır; retry_after saniye sonra tekrar denenebilir
+class Overloaded(Exception):
+    def __init__(self, scope, retry_after):
+        super().__init__(scope)
+        self.scope = scope
+        self.retry_after = retry_after
+
+
+# Bucket durumunu süreç belleğinde tutan backend (worker'lar arası paylaşılmaz)
+# Paylaşılan backend'ler aynı take/prune arayüzünü uygular (bkz. storage.RateLimitStore)
+class MemoryBucketBackend:
+    def __init__(self, max_keys=10000):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    # Bucket'tan cost kadar token al; yeterli token yoksa beklenmesi gereken süreyi döndür
+    def take(self, key, rate, burst, now, cost=1):
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated_at) * rate)
+            wait = 0.0
+            if tokens >= cost:
+                tokens -= cost
+            else:
+                wait = (cost - tokens) / rate
+            self._buckets[key] = (tokens, now)
+            # En uzun süredir kullanılmayan bucket'lar atılır (dolu bucket'la eşdeğer)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return wait
+
+    # before'dan beri kullanılmayan bucket'ları sil
+    def prune(self, before):
+        with self._lock:
+            while self._buckets:
+                key, (_, updated_at) = next(iter(self._buckets.items()))
+                if updated_at >= before:
+                    break
+                del self._buckets[key]
+
+
+# Rota sınıfı bazında token bucket limitleri
+# limits: {rota sınıfı: (dakika başına istek, burst)}
+class RateLimiter:
+    def __init__(self, backend, limits, enabled=True, prune_interval=60):
+        self.backend = backend
+        self.limits = {name: (per_minute / 60, burst) for name, (per_minute, burst) in limits.items()}
+        self.enabled = enabled
+        self.prune_interval = prune_interval
+        self.rejected = dict.fromkeys(limits, 0)
+        self._pruned_at = time.time()
+        self._lock = threading.Lock()
+
+    # cost: isteğin harcadığı token sayısı (ör. ZIP'teki doküman sayısı)
+    # Bucket'tan fazlası hiçbir zaman karşılanamayacağından en fazla burst kadar alınır
+    def check(self, route_class, client, cost=1):
+        if not self.enabled:
+            return
+        rate, burst = self.limits[route_class]
+        now = time.time()
+        self._prune(now)
+        wait = self.backend.take(f'{route_class}:{client}', rate, burst, now, min(cost, burst))
+        if wait > 0:
+            with self._lock:
+                self.rejected[route_class] += 1
+            raise Overloaded(route_class, wait)
+
+    # Boşta kalan bucket'lar en geç burst / rate saniyede dolar, sonra silinebilir
+    def _prune(self, now):
+        if now - self._pruned_at < self.prune_interval:
+            return
+        self._pruned_at = now
+        idle = max(burst / rate for rate, burst in self.limits.values())
+        self.backend.prune(now - max(idle, self.prune_interval))
+
+    def stats(self):
+        return {
+            'enabled': self.enabled,
+            'limits': {name: {'per_minute': rate * 60, 'burst': burst} for name, (rate, burst) in self.limits.items()},
+            'rejected': dict(self.rejected)
+        }
+
+
+# Süreç genelinde eşzamanlı iş sınırı (render, upstream çağrısı)
+# Varsayılan olarak beklemez: slot yoksa Overloaded fırlatılır
+class ConcurrencyLimit:
+    def __init__(self, name, limit, retry_after=1):
+        self.name = name
+        self.limit = limit
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self.rejected = 0
+        self._semaphore = threading.BoundedSemaphore(limit)
+        self._lock = threading.Lock()
+
+    def acquire(self, wait=False):
+        if not self._semaphore.acquire(blocking=wait):
+            with self._lock:
+                self.rejected += 1
+            raise Overloaded(self.name, self.retry_after)
+        with self._lock:
+            self.in_flight += 1
+
+    # Boş slot yoksa beklemeden reddet (slotları sırayla bekleyecek uzun işler başlamadan elenir)
+    def check(self):
+        with self._lock:
+            if self.in_flight >= self.limit:
+                self.rejected += 1
+                raise Overloaded(self.name, self.retry_after)
+
+    def release(self):
+        with self._lock:
+            self.in_flight -= 1
+        self._semaphore.release()
+
+    # wait=True: slot boşalana kadar bekle (cevabı zaten başlamış işler için)
+    @contextmanager
+    def slot(self, wait=False):
+        self.acquire(wait)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self):
+        return {'limit': self.limit, 'in_flight': self.in_flight, 'rejected': self.rejected}
+
+
+# Retry-After başlığı tam saniye olmalıdır
+def retry_after_header(seconds):
+    return str(max(1, math.ceil(seconds)))
@@ -0,0 +1,151 @@
+import os
+import random
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+
+
+# Devre açıkken upstream çağrılmadan fırlatılır
+class CircuitOpenError(requests.RequestException):
+    pass
+
+
+# Art arda hatalardan sonra upstream'i bir süre çağırmayan devre kesici
+# closed -> open (failure_threshold hata) -> half_open (reset_timeout sonra tek deneme)
+class CircuitBreaker:
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = 'closed'
+        self._failures = 0
+        self._opened_at = 0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == 'closed':
+                return True
+            if self.state == 'open' and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = 'half_open'
+            # Half-open durumda aynı anda yalnızca bir deneme isteği geçer
+            if self.state == 'half_open' and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = 'closed'
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self.state == 'half_open' or self._failures >= self.failure_threshold:
+                self.state = 'open'
+                self._opened_at = time.monotonic()
+
+
+# Tekrar denemeleri isteklerin belirli bir oranıyla sınırlar
+# Upstream çöktüğünde retry'lar yükü katlamaz
+class RetryBudget:
+    def __init__(self, ratio=0.2, max_tokens=10):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def withdraw(self):
+        with self._lock:
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+
+# Cache anahtarı için mesajı normalize et (büyük/küçük harf, boşluk, noktalama)
+def normalize_message(message):
+    return ' '.join(message.casefold().split()).strip(' ?!.')
+
+
+# AIFlow webhook istemcisi
+# Tek bir Session üzerinden keep-alive bağlantılar tekrar kullanılır
+class AIFlowClient:
+    RETRYABLE_STATUS = (502, 503, 504)
+
+    def __init__(self, url, connect_timeout=3.05, read_timeout=30, pool_size=100,
+                 max_retries=2, backoff=0.2, breaker=None, retry_budget=None):
+        self.url = url
+        self.timeout = (connect_timeout, read_timeout)
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.breaker = breaker or CircuitBreaker()
+        self.retry_budget = retry_budget or RetryBudget()
+        self._session = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    # Fork sonrası child process kendi bağlantı havuzunu açar
+    def _get_session(self):
+        if self._session is None or self._pid != os.getpid():
+            with self._lock:
+                if self._session is None or self._pid != os.getpid():
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_size)
+                    session.mount('https://', adapter)
+                    session.mount('http://', adapter)
+                    self._session = session
+                    self._pid = os.getpid()
+        return self._session
+
+    def post_message(self, message, **kwargs):
+        if not self.breaker.allow():
+            raise CircuitOpenError('AIFlow circuit is open')
+
+        self.retry_budget.deposit()
+        attempt = 0
+        while True:
+            response = None
+            error = None
+            try:
+                response = self._get_session().post(
+                    self.url,
+                    json={'message': message},
+                    timeout=self.timeout,
+                    **kwargs
+                )
+            except requests.ConnectionError as e:
+                # Bağlantı kurulamadı (connect timeout dahil), tekrar denenebilir
+                error = e
+            except requests.RequestException:
+                # Read timeout vb. tekrar denenmez; kullanıcı zaten uzun süre bekledi
+                self.breaker.record_failure()
+                raise
+
+            if response is not None and response.status_code not in self.RETRYABLE_STATUS:
+                if response.status_code >= 500:
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
+                return response
+
+            if attempt >= self.max_retries or not self.retry_budget.withdraw():
+                self.breaker.record_failure()
+                if error is not None:
+                    raise error
+                return response
+
+            if response is not None:
+                response.close()
+            attempt += 1
+            # Full jitter ile üstel bekleme
+            time.sleep(random.uniform(0, self.backoff * (2 ** attempt)))
@@ -1,42 +1,194 @@
-from flask import Flask, request, jsonify, send_file, render_template, make_response
-from flask_cors import CORS
 import os
+
+# gevent modunda ağ I/O'su cooperative çalışır; bir process yüzlerce bekleyen
+# chatbot isteğini açık tutabilir. Monkey patch diğer importlardan önce yapılmalı.
+GEVENT_ENABLED = os.environ.get('GEVENT', 'False').lower() == 'true'
+if GEVENT_ENABLED:
+    from gevent import monkey
+    monkey.patch_all()
+
+from flask import Flask, Blueprint, current_app, g, request, jsonify, send_file, render_template, make_response, Response, stream_with_context
+from flask_cors import CORS
+from werkzeug.middleware.proxy_fix import ProxyFix
 import json
 import logging
+import math
 import requests
 from datetime import datetime
 import tempfile
-import markdown
-from docx import Document
-import io
-from weasyprint import HTML
+import threading
+import time
 import uuid
+import base64
+import hashlib
 import jwt
 from functools import wraps
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from storage import RequirementStore, CatalogStore, ExportJobStore, RevocationStore, RateLimitStore, IdempotencyConflict
+from cache import RenderCache, LRUCache, TTLCache, render_key, file_hash
+from exporters import render_pdf, render_docx, PDF_STYLESHEETS, PDF_RENDERERS, DOCX_SKELETONS, ZipStream, IMPORT_TIMINGS
+from export_jobs import ExportJobQueue, ExportQueueFull
+from catalog import CatalogSnapshot
+from sizing import MAX_RESOURCE_VALUE
+from placement import component_demands, plan, PlacementError
+from aiflow_client import AIFlowClient, CircuitBreaker, CircuitOpenError, normalize_message
+from tokens import TokenVerifier, TokenRejected
+from retention import RetentionSweeper
+from admission import RateLimiter, MemoryBucketBackend, ConcurrencyLimit, Overloaded, retry_after_header
+import metrics
+from metrics import REGISTRY, SharedMetrics, stage
 
 # Loglama yapılandırması
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = Flask(__name__, static_folder='static', template_folder='templates')
-CORS(app)  # Cross-Origin Resource Sharing etkinleştir
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
-# Uygulama konfigürasyonu
-app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'cbot-secret-key-change-in-production')
-app.config['JWT_EXPIRATION'] = 3600  # Token süresi (saniye)
+# Tüm route'lar bu blueprint üzerinde tanımlanır, uygulama create_app ile oluşturulur
+api = Blueprint('api', __name__)
 
 # n8n webhook URL'i (gerçek uygulamada env dosyasından alınabilir)
 CBOT_WEBHOOK_URL = os.environ.get('CBOT_WEBHOOK_URL', 'https://aiflow.test.cbot.ai/webhook-test/cbot-setup-assistant/gereklilikler')
 
-# Mock veritabanı (gerçek uygulamada gerçek bir veritabanı kullanılır)
+# Webhook için paylaşılan, bağlantı havuzlu istemci
+AIFLOW_CLIENT = AIFlowClient(
+    CBOT_WEBHOOK_URL,
+    connect_timeout=float(os.environ.get('CBOT_WEBHOOK_CONNECT_TIMEOUT', 3.05)),
+    read_timeout=float(os.environ.get('CBOT_WEBHOOK_READ_TIMEOUT', 30)),
+    pool_size=int(os.environ.get('CBOT_WEBHOOK_POOL_SIZE', 100)),
+    max_retries=int(os.environ.get('CBOT_WEBHOOK_MAX_RETRIES', 2)),
+    breaker=CircuitBreaker(
+        failure_threshold=int(os.environ.get('CBOT_WEBHOOK_FAILURE_THRESHOLD', 5)),
+        reset_timeout=float(os.environ.get('CBOT_WEBHOOK_RESET_TIMEOUT', 30))
+    )
+)
+
+# Sık sorulan sorular için chatbot cevap cache'i (normalize edilmiş mesaj -> cevap)
+CHAT_RESPONSE_CACHE = TTLCache(
+    max_size=int(os.environ.get('CHAT_CACHE_SIZE', 1024)),
+    ttl=float(os.environ.get('CHAT_CACHE_TTL', 600))
+)
+
+# Mock kullanıcı veritabanı (gerçek uygulamada gerçek bir veritabanı kullanılır)
 DATABASE = {
     'users': {
         'user@example.com': {'password': 'password123', 'role': 'user'},
         'admin@example.com': {'password': 'admin123', 'role': 'admin'}
-    },
-    'requirements': []
+    }
+}
+
+# Gereksinim dokümanları kalıcı depoda tutulur
+REQUIREMENTS_DB_PATH = os.environ.get(
+    'REQUIREMENTS_DB_PATH',
+    os.path.join(BASE_DIR, 'data', 'requirements.db')
+)
+REQUIREMENT_STORE = RequirementStore(
+    REQUIREMENTS_DB_PATH,
+    cache_size=int(os.environ.get('REQUIREMENTS_CACHE_SIZE', 1024))
+)
+
+# Admin katalog değişiklikleri ve export işleri de aynı veritabanında tutulur (worker'lar arası paylaşım)
+CATALOG_STORE = CatalogStore(REQUIREMENTS_DB_PATH)
+EXPORT_JOB_STORE = ExportJobStore(REQUIREMENTS_DB_PATH)
+
+# Doğrulanmış JWT cache'i ve paylaşılan iptal listesi
+TOKEN_VERIFIER = TokenVerifier(
+    RevocationStore(REQUIREMENTS_DB_PATH),
+    max_size=int(os.environ.get('TOKEN_CACHE_SIZE', 1024)),
+    sync_interval=float(os.environ.get('TOKEN_REVOCATION_SYNC_INTERVAL', 1.0))
+)
+
+# İstemci (IP) başına rota sınıfı limitleri: (dakika başına istek, burst)
+RATE_LIMITS = {
+    'chat': (float(os.environ.get('RATE_LIMIT_CHAT_PER_MINUTE', 30)), int(os.environ.get('RATE_LIMIT_CHAT_BURST', 10))),
+    'generate': (float(os.environ.get('RATE_LIMIT_GENERATE_PER_MINUTE', 60)), int(os.environ.get('RATE_LIMIT_GENERATE_BURST', 20))),
+    'export': (float(os.environ.get('RATE_LIMIT_EXPORT_PER_MINUTE', 30)), int(os.environ.get('RATE_LIMIT_EXPORT_BURST', 10)))
 }
 
+# Bucket'lar varsayılan olarak worker belleğinde tutulur (limit worker başınadır);
+# RATE_LIMIT_BACKEND=sqlite ile tüm worker'lar aynı bucket'ları paylaşır
+RATE_LIMITER = RateLimiter(
+    RateLimitStore(REQUIREMENTS_DB_PATH) if os.environ.get('RATE_LIMIT_BACKEND', 'memory') == 'sqlite' else MemoryBucketBackend(),
+    RATE_LIMITS,
+    enabled=os.environ.get('RATE_LIMIT_ENABLED', 'True').lower() == 'true'
+)
+
+# Worker başına aynı anda yapılan senkron render ve AIFlow çağrısı sınırı
+# Sınır doluysa yeni istekler beklemeden 429 ile reddedilir
+RENDER_SLOTS = ConcurrencyLimit('render', int(os.environ.get('MAX_INFLIGHT_RENDERS', 2)))
+UPSTREAM_SLOTS = ConcurrencyLimit('upstream', int(os.environ.get('MAX_INFLIGHT_UPSTREAM', 64)))
+
+# PDF/DOCX render cache'i (diskteki toplam boyut sınırı)
+RENDER_CACHE = RenderCache(
+    os.environ.get('RENDER_CACHE_DIR', os.path.join(os.path.dirname(REQUIREMENTS_DB_PATH), 'renders')),
+    max_bytes=int(os.environ.get('RENDER_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+)
+
+# Şablon özetleri cache anahtarına girer; şablon değişince eski çıktılar kullanılmaz
+PDF_TEMPLATE_HASH = file_hash(os.path.join(BASE_DIR, 'templates', 'requirement_template.html'), *PDF_STYLESHEETS)
+DOCX_LAYOUT_VERSION = 'docx-1'  # add_requirement_content_to_docx değiştiğinde artırın
+
+# Saklama politikası (0 = sınırsız): süresi dolan veya sayı sınırını aşan dokümanlar ve
+# render çıktıları arka planda silinir; silinen id'ler TOMBSTONE_TTL_DAYS boyunca 410 döndürür
+RETENTION_SWEEPER = RetentionSweeper(
+    REQUIREMENT_STORE,
+    RENDER_CACHE,
+    lambda req_id: [export_cache_key(req_id, fmt) for fmt in EXPORT_CONTENT_TYPES],
+    max_age_days=float(os.environ.get('REQUIREMENT_RETENTION_DAYS', 0)),
+    max_count=int(os.environ.get('REQUIREMENT_MAX_COUNT', 0)),
+    interval=float(os.environ.get('RETENTION_SWEEP_INTERVAL', 300)),
+    tombstone_days=float(os.environ.get('TOMBSTONE_TTL_DAYS', 90))
+)
+
+# Arka plan export işleri (process pool)
+# Her gunicorn worker'ı kendi pool'unu açar; varsayılan boyut çekirdekleri worker'lar arasında paylaştırır
+WEB_WORKERS = int(os.environ.get('WEB_CONCURRENCY', 1))
+EXPORT_JOBS = ExportJobQueue(
+    RENDER_CACHE,
+    EXPORT_JOB_STORE,
+    max_workers=int(os.environ.get('EXPORT_POOL_SIZE', max(1, (os.cpu_count() or 1) // WEB_WORKERS))),
+    max_pending=int(os.environ.get('EXPORT_QUEUE_DEPTH', 32))
+)
+
+EXPORT_CONTENT_TYPES = {
+    'pdf': 'application/pdf',
+    'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+}
+
+BATCH_MAX_SIZE = int(os.environ.get('BATCH_MAX_SIZE', 100))
+
+# Tekrarlanan generate istekleri: aynı içerikli doküman tekrar kaydedilmez,
+# Idempotency-Key ile gelen tekrar denemeler IDEMPOTENCY_KEY_TTL saniye boyunca ilk cevabı alır
+REQUIREMENT_DEDUP = os.environ.get('REQUIREMENT_DEDUP', 'True').lower() == 'true'
+IDEMPOTENCY_KEY_TTL = int(os.environ.get('IDEMPOTENCY_KEY_TTL', 24 * 3600))
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+# Admin doküman listesi sayfa boyutu
+ADMIN_PAGE_SIZE = 50
+ADMIN_MAX_PAGE_SIZE = 200
+
+# Toplu ZIP export: aynı anda render edilen doküman sayısı ve istek başına üst sınır
+ZIP_EXPORT_CONCURRENCY = int(os.environ.get('ZIP_EXPORT_CONCURRENCY', 2))
+ZIP_EXPORT_MAX_IDS = int(os.environ.get('ZIP_EXPORT_MAX_IDS', BATCH_MAX_SIZE))
+# Tüm ZIP istekleri aynı render thread'lerini kullanır (thread'ler ilk işte, worker içinde açılır)
+ZIP_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.environ.get('ZIP_EXPORT_THREADS', ZIP_EXPORT_CONCURRENCY * 2)),
+    thread_name_prefix='zip-export'
+)
+
+# Yerleşim planlayıcı: sunucu tipi verilmezse kullanılacak tipler (maliyet varsayılan olarak CPU sayısı)
+DEFAULT_NODE_SHAPES = [
+    {'name': 'small', 'cpu': 8, 'ram': 16, 'disk': 200},
+    {'name': 'medium', 'cpu': 16, 'ram': 32, 'disk': 500},
+    {'name': 'large', 'cpu': 32, 'ram': 64, 'disk': 1000},
+    {'name': 'gpu', 'cpu': 16, 'ram': 64, 'disk': 500, 'gpu_ram': 24}
+]
+PLACEMENT_MAX_SHAPES = 20
+PLACEMENT_MAX_EXPANSIONS = int(os.environ.get('PLACEMENT_MAX_EXPANSIONS', 10000))
+
+EMPTY_BOT_MESSAGE = 'Mesajınız alındı, ancak bir cevap oluşturulamadı.'
+SSE_CHUNK_SIZE = 64  # Stream etmeyen upstream cevapları bu boyutta parçalanır
+
 # Modül bilgileri
 MODULE_INFO = {
     'core': {
@@ -198,6 +350,125 @@ DB_INFO = {
     }
 }
 
+# MODULE_INFO/SERVICE_INFO varsayılan katalogdur ve değiştirilmez
+# Kullanılan katalog, varsayılanlara kalıcı değişiklikler uygulanarak oluşturulan görüntüdür
+def load_catalog():
+    version, overrides = CATALOG_STORE.load()
+    return CatalogSnapshot.build(MODULE_INFO, SERVICE_INFO, overrides, version, DB_INFO)
+
+CATALOG = load_catalog()
+_catalog_lock = threading.Lock()
+
+# Seçim bazlı hesaplama sonuçları (katalog sürümüne bağlı)
+SIZING_MEMO = LRUCache(max_size=int(os.environ.get('SIZING_MEMO_SIZE', 4096)))
+
+# Metrikler (/metrics)
+# Worker'lar metriklerini periyodik olarak METRICS_DIR altına yazar; /metrics tüm worker'ları birleştirir
+SHARED_METRICS = SharedMetrics(
+    REGISTRY,
+    os.environ.get('METRICS_DIR', os.path.join(tempfile.gettempdir(), 'cbot-metrics')),
+    flush_interval=float(os.environ.get('METRICS_FLUSH_INTERVAL', 2.0))
+)
+REQUEST_SECONDS = REGISTRY.histogram(
+    'cbot_http_request_duration_seconds',
+    'Request latency per route (streaming responses: time until the response starts)',
+    ('method', 'route', 'status')
+)
+EXPORTS_IN_FLIGHT = REGISTRY.gauge(
+    'cbot_exports_in_flight',
+    'Synchronous exports (single downloads and ZIP entries) being rendered in request threads'
+)
+REGISTRY.gauge(
+    'cbot_export_jobs_pending',
+    'Export jobs queued or running in the process pool',
+    function=lambda: {(): EXPORT_JOBS.pending()}
+)
+
+# Cache isabet sayaçları (oranlar /metrics'te birleştirilmiş değerlerden hesaplanır)
+def cache_counters(attribute):
+    caches = {
+        'sizing': SIZING_MEMO,
+        'chat': CHAT_RESPONSE_CACHE,
+        'token': TOKEN_VERIFIER.cache,
+        'render': RENDER_CACHE
+    }
+    return {(name, ): getattr(cache, attribute) for name, cache in caches.items()}
+
+REGISTRY.counter('cbot_cache_hits_total', 'Cache hits', ('cache',), function=lambda: cache_counters('hits'))
+REGISTRY.counter('cbot_cache_misses_total', 'Cache misses', ('cache',), function=lambda: cache_counters('misses'))
+REGISTRY.gauge(
+    'cbot_export_library_import_seconds',
+    'Time spent importing each export library in this process',
+    ('library',),
+    function=lambda: {(name, ): seconds for name, seconds in IMPORT_TIMINGS.items()}
+)
+
+# 429 ile reddedilen istekler: hız limitleri rota sınıfına, eşzamanlılık sınırları ada göre
+def admission_rejections():
+    values = {(name, ): count for name, count in RATE_LIMITER.rejected.items()}
+    values.update({(slots.name, ): slots.rejected for slots in (RENDER_SLOTS, UPSTREAM_SLOTS)})
+    return values
+
+REGISTRY.counter(
+    'cbot_admission_rejected_total',
+    'Requests rejected with 429 by rate limits (route class) and concurrency caps',
+    ('scope',),
+    function=admission_rejections
+)
+REGISTRY.counter(
+    'cbot_requirements_evicted_total',
+    'Requirement documents removed by the retention sweeper',
+    function=lambda: {(): RETENTION_SWEEPER.evicted}
+)
+REGISTRY.counter(
+    'cbot_render_cache_evictions_total',
+    'Rendered exports removed to keep the render cache under its size limit',
+    function=lambda: {(): RENDER_CACHE.evictions}
+)
+REGISTRY.gauge(
+    'cbot_admission_in_flight',
+    'Synchronous renders and upstream calls holding a concurrency slot',
+    ('scope',),
+    function=lambda: {(slots.name, ): slots.in_flight for slots in (RENDER_SLOTS, UPSTREAM_SLOTS)}
+)
+
+@api.before_app_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@api.before_app_request
+def start_retention_sweeper():
+    RETENTION_SWEEPER.start()
+
+@api.after_app_request
+def record_request_metrics(response):
+    started = g.pop('request_started', None)
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        REQUEST_SECONDS.observe(time.perf_counter() - started, request.method, route, str(response.status_code))
+        SHARED_METRICS.start()
+    return response
+
+# Prometheus metin formatında metrikler
+@api.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    snapshot = SHARED_METRICS.collect()
+    
+    # Tüm worker'ların toplamından isabet oranı
+    hits = {tuple(labels): value for labels, value in snapshot.get('cbot_cache_hits_total', {}).get('samples', [])}
+    misses = {tuple(labels): value for labels, value in snapshot.get('cbot_cache_misses_total', {}).get('samples', [])}
+    snapshot['cbot_cache_hit_ratio'] = {
+        'type': 'gauge',
+        'help': 'Cache hit ratio across all workers',
+        'labels': ['cache'],
+        'samples': [
+            [list(labels), hits[labels] / (hits[labels] + misses.get(labels, 0)) if hits[labels] + misses.get(labels, 0) else 0.0]
+            for labels in hits
+        ]
+    }
+    
+    return Response(metrics.render(snapshot), mimetype='text/plain; version=0.0.4')
+
 # JWT token doğrulama decoratörü
 def token_required(f):
     @wraps(f)
@@ -210,14 +481,12 @@ def token_required(f):
             if auth_header.startswith('Bearer '):
                 token = auth_header.split(' ')[1]
         
-        if not token:
-            return jsonify({'message': 'Token bulunamadı!'}), 401
-        
         try:
-            # Token'ı doğrula
-            data = jwt.decode(token, app.config['SECRET_KEY'], algorithms=['HS256'])
-            current_user = {'email': data['email'], 'role': data['role']}
-        except:
+            # Token'ı doğrula (daha önce doğrulanmış token'lar cache'ten gelir)
+            current_user = TOKEN_VERIFIER.verify(token, current_app.config['SECRET_KEY'])
+        except TokenRejected as e:
+            if e.reason == 'missing':
+                return jsonify({'message': 'Token bulunamadı!'}), 401
             return jsonify({'message': 'Token geçersiz!'}), 401
         
         return f(current_user, *args, **kwargs)
@@ -234,13 +503,39 @@ def admin_required(f):
     
     return decorated
 
+# Limit aşımı cevabı
+def overloaded_response(error):
+    if error.scope in RATE_LIMITS:
+        message = 'Çok fazla istek gönderildi. Lütfen biraz bekleyip tekrar deneyin.'
+    else:
+        message = 'Sunucu şu anda yoğun. Lütfen daha sonra tekrar deneyin.'
+    response = jsonify({'message': message})
+    response.headers['Retry-After'] = retry_after_header(error.retry_after)
+    return response, 429
+
+# İstemci başına hız limiti decoratörü (route_class: RATE_LIMITS anahtarı)
+# Maliyeti içeriğe bağlı rotalar doğrulamadan sonra RATE_LIMITER.check'i kendisi çağırır
+def rate_limited(route_class):
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            try:
+                RATE_LIMITER.check(route_class, request.remote_addr)
+            except Overloaded as e:
+                return overloaded_response(e)
+            return f(*args, **kwargs)
+        
+        return decorated
+    
+    return decorator
+
 # Ana sayfa
-@app.route('/')
+@api.route('/')
 def index():
-    return app.send_static_file('index.html')
+    return current_app.send_static_file('index.html')
 
 # Kullanıcı girişi
-@app.route('/api/auth/login', methods=['POST'])
+@api.route('/api/auth/login', methods=['POST'])
 def login():
     data = request.get_json()
     email = data.get('email')
@@ -263,9 +558,11 @@ def login():
         {
             'email': email,
             'role': DATABASE['users'][email]['role'],
-            'exp': datetime.utcnow().timestamp() + app.config['JWT_EXPIRATION']
+            'exp': datetime.utcnow().timestamp() + current_app.config['JWT_EXPIRATION'],
+            'iat': time.time(),
+            'jti': uuid.uuid4().hex
         },
-        app.config['SECRET_KEY'],
+        current_app.config['SECRET_KEY'],
         algorithm='HS256'
     )
     
@@ -278,9 +575,29 @@ def login():
         }
     }), 200
 
+# Çıkış: kullanılan token iptal edilir
+@api.route('/api/auth/logout', methods=['POST'])
+@token_required
+def logout(current_user):
+    token = request.headers['Authorization'].split(' ')[1]
+    TOKEN_VERIFIER.revoke_token(token, current_app.config['SECRET_KEY'])
+    return jsonify({'message': 'Çıkış yapıldı.'}), 200
+
+# Kullanıcının tüm token'larını iptal etme (rol değişikliği sonrası yeniden giriş gerekir)
+@api.route('/api/admin/users/<email>/revoke-tokens', methods=['POST'])
+@token_required
+@admin_required
+def revoke_user_tokens(current_user, email):
+    if email not in DATABASE['users']:
+        return jsonify({'message': 'Kullanıcı bulunamadı!'}), 404
+    
+    TOKEN_VERIFIER.revoke_user(email)
+    return jsonify({'message': 'Kullanıcının tüm oturumları sonlandırıldı.'}), 200
+
 # Chatbot mesaj işleme
 # Chatbot mesaj işleme
-@app.route('/api/chatbot/message', methods=['POST'])
+@api.route('/api/chatbot/message', methods=['POST'])
+@rate_limited('chat')
 def process_message():
     data = request.get_json()
     user_message = data.get('message')
@@ -288,27 +605,36 @@ def process_message():
     if not user_message:
         return jsonify({'message': 'Mesaj içeriği gereklidir!'}), 400
     
+    # Aynı soru daha önce cevaplandıysa upstream'e gitme
+    cache_key = normalize_message(user_message)
+    bot_message = CHAT_RESPONSE_CACHE.get(cache_key)
+    if bot_message is not None:
+        return jsonify({
+            'response': bot_message
+        }), 200
+    
     try:
         # AIFlow webhook'a mesajı ilet
-        webhook_response = requests.post(
-            CBOT_WEBHOOK_URL,
-            json={'message': user_message},
-            timeout=30
-        )
+        with UPSTREAM_SLOTS.slot(), stage('aiflow_webhook'):
+            webhook_response = AIFLOW_CLIENT.post_message(user_message)
         
         if webhook_response.status_code == 200:
-            response_data = webhook_response.json()
-            
-            # Eğer response_data bir listeyse, ilk öğeyi al
-            if isinstance(response_data, list) and len(response_data) > 0:
-                bot_message = response_data[0].get('output', 'Mesajınız alındı, ancak bir cevap oluşturulamadı.')
-            else:
-                bot_message = 'Mesajınız alındı, ancak bir cevap oluşturulamadı.'
+            bot_message = extract_bot_message(webhook_response.json())
+            if bot_message != EMPTY_BOT_MESSAGE:
+                CHAT_RESPONSE_CACHE.set(cache_key, bot_message)
         else:
             # Webhook başarısız olursa basit bir cevap döndür
             logger.warning(f"AIFlow webhook failed with status {webhook_response.status_code}")
             bot_message = "Şu anda sisteme ulaşılamıyor. Lütfen daha sonra tekrar deneyin."
     
+    except Overloaded as e:
+        # Aynı anda bekleyen upstream çağrısı sınırı dolu
+        return overloaded_response(e)
+    
+    except CircuitOpenError:
+        # Upstream kısa süre önce art arda hata verdi, timeout beklemeden cevap dön
+        bot_message = "Şu anda sisteme ulaşılamıyor. Lütfen daha sonra tekrar deneyin."
+    
     except requests.RequestException as e:
         logger.error(f"Error connecting to AIFlow webhook: {e}")
         bot_message = "Chatbot servisine bağlanırken bir hata oluştu. Lütfen daha sonra tekrar deneyin."
@@ -317,16 +643,130 @@ def process_message():
         'response': bot_message
     }), 200
 
-# Gereksinim dokümanı oluşturma
-@app.route('/api/requirements/generate', methods=['POST'])
-def generate_requirements():
+# AIFlow cevabından bot mesajını çıkar
+def extract_bot_message(response_data):
+    # Eğer response_data bir listeyse, ilk öğeyi al
+    if isinstance(response_data, list) and len(response_data) > 0:
+        return response_data[0].get('output', EMPTY_BOT_MESSAGE)
+    return EMPTY_BOT_MESSAGE
+
+# SSE olayı oluştur
+def sse_event(data, event=None):
+    payload = f'data: {json.dumps(data, ensure_ascii=False)}\n\n'
+    if event:
+        payload = f'event: {event}\n' + payload
+    return payload
+
+# Stream edilen satırdan metin parçasını çıkar (JSON ise output/content alanı)
+def extract_stream_delta(line):
+    try:
+        item = json.loads(line)
+    except ValueError:
+        return line
+    if isinstance(item, dict):
+        return item.get('output') or item.get('content') or item.get('text') or ''
+    return str(item)
+
+# Chatbot cevabını Server-Sent Events olarak stream etme
+@api.route('/api/chatbot/stream', methods=['POST'])
+@rate_limited('chat')
+def stream_message():
     data = request.get_json()
+    user_message = data.get('message')
+    
+    if not user_message:
+        return jsonify({'message': 'Mesaj içeriği gereklidir!'}), 400
+    
+    cache_key = normalize_message(user_message)
+    cached_message = CHAT_RESPONSE_CACHE.get(cache_key)
+    if cached_message is None:
+        # Upstream slotu stream boyunca tutulur, cevap kapatılınca bırakılır
+        try:
+            UPSTREAM_SLOTS.acquire()
+        except Overloaded as e:
+            return overloaded_response(e)
+    
+    def generate():
+        if cached_message is not None:
+            for i in range(0, len(cached_message), SSE_CHUNK_SIZE):
+                yield sse_event({'delta': cached_message[i:i + SSE_CHUNK_SIZE]})
+            yield sse_event({}, event='done')
+            return
+        
+        try:
+            with stage('aiflow_webhook_stream_start'):
+                webhook_response = AIFLOW_CLIENT.post_message(user_message, stream=True)
+        except CircuitOpenError:
+            yield sse_event({'message': "Şu anda sisteme ulaşılamıyor. Lütfen daha sonra tekrar deneyin."}, event='error')
+            return
+        except requests.RequestException as e:
+            logger.error(f"Error connecting to AIFlow webhook: {e}")
+            yield sse_event({'message': "Chatbot servisine bağlanırken bir hata oluştu. Lütfen daha sonra tekrar deneyin."}, event='error')
+            return
+        
+        with webhook_response:
+            if webhook_response.status_code != 200:
+                logger.warning(f"AIFlow webhook failed with status {webhook_response.status_code}")
+                yield sse_event({'message': "Şu anda sisteme ulaşılamıyor. Lütfen daha sonra tekrar deneyin."}, event='error')
+                return
+            
+            content_type = webhook_response.headers.get('Content-Type', '')
+            # charset belirtilmemişse requests text/* için ISO-8859-1 varsayar, ndjson'da hiç çözmez
+            webhook_response.encoding = 'utf-8'
+            deltas = []
+            try:
+                if 'text/event-stream' in content_type:
+                    # Upstream SSE ise olayları geldikçe ilet
+                    for line in webhook_response.iter_lines(decode_unicode=True):
+                        if line and line.startswith('data:'):
+                            delta = extract_stream_delta(line[5:].strip())
+                            if delta:
+                                deltas.append(delta)
+                                yield sse_event({'delta': delta})
+                elif 'ndjson' in content_type:
+                    # Satır satır JSON stream
+                    for line in webhook_response.iter_lines(decode_unicode=True):
+                        if line:
+                            delta = extract_stream_delta(line)
+                            if delta:
+                                deltas.append(delta)
+                                yield sse_event({'delta': delta})
+                else:
+                    # Upstream stream etmiyorsa cevabı parçalar halinde gönder
+                    bot_message = extract_bot_message(webhook_response.json())
+                    if bot_message != EMPTY_BOT_MESSAGE:
+                        deltas.append(bot_message)
+                    for i in range(0, len(bot_message), SSE_CHUNK_SIZE):
+                        yield sse_event({'delta': bot_message[i:i + SSE_CHUNK_SIZE]})
+            except (requests.RequestException, ValueError) as e:
+                logger.error(f"Error reading AIFlow webhook stream: {e}")
+                yield sse_event({'message': "Chatbot cevabı okunurken bir hata oluştu."}, event='error')
+                return
+        
+        # Eksiksiz alınan cevabı cache'le
+        if deltas:
+            CHAT_RESPONSE_CACHE.set(cache_key, ''.join(deltas))
+        
+        yield sse_event({}, event='done')
+    
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    if cached_message is None:
+        response.call_on_close(UPSTREAM_SLOTS.release)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # nginx'in cevabı tamponlamasını engelle
+    return response
+
+# Gereksinim yapılandırmasını doğrula
+# Hata varsa (cevap, status) döndürür, geçerliyse None
+def validate_requirement_config(data):
+    if not isinstance(data, dict):
+        return {'message': 'Geçersiz istek içeriği!'}, 400
     
     # Gerekli alanların kontrolü
     required_fields = ['environment', 'environmentType', 'coreModules', 'database']
     for field in required_fields:
         if field not in data:
-            return jsonify({'message': f'{field} alanı gereklidir!'}), 400
+            return {'message': f'{field} alanı gereklidir!'}, 400
     
     # Seçilen modül ve servisleri birleştir
     selected_modules = data.get('coreModules', [])
@@ -334,86 +774,590 @@ def generate_requirements():
     
     # Veritabanı kontrolü
     database = data.get('database')
-    if database not in DB_INFO:
-        return jsonify({'message': 'Geçersiz veritabanı seçimi!'}), 400
+    if not isinstance(database, str) or database not in DB_INFO:
+        return {'message': 'Geçersiz veritabanı seçimi!'}, 400
+    
+    # Seçimler metin kimliklerinden oluşan listeler olmalıdır
+    if not isinstance(selected_modules, list) or not isinstance(selected_services, list):
+        return {'message': 'Geçersiz modül/servis seçimi!'}, 400
+    if not all(isinstance(item_id, str) for item_id in selected_modules + selected_services):
+        return {'message': 'Modül/servis kimlikleri metin olmalıdır!'}, 400
+    
+    # Tanımsız modül/servis kontrolü
+    unknown = [m for m in selected_modules if m not in MODULE_INFO] + [s for s in selected_services if s not in SERVICE_INFO]
+    if unknown:
+        return {'message': f"Geçersiz modül/servis seçimi: {', '.join(map(str, unknown))}"}, 400
     
     # Classifier modülü için MSSQL kontrolü
     if 'classifier' in selected_modules and database != 'mssql':
-        return jsonify({
+        return {
             'message': 'Classifier modülü yalnızca MSSQL veritabanı ile çalışmaktadır!',
             'warning': True
-        }), 200  # İşlemi devam ettirmek için 200 döndürüyoruz, frontend tarafında uyarı gösterilecek
+        }, 200  # İşlemi devam ettirmek için 200 döndürüyoruz, frontend tarafında uyarı gösterilecek
     
-    # Gereksinim belgesi oluşturma
+    return None
+
+# Gereksinim belgesi oluştur ve benzersiz bir ID ata
+def build_requirement(data):
     requirements = generate_requirements_document(data)
-    
-    # Benzersiz bir ID ile gereksinimleri kaydet
-    req_id = str(uuid.uuid4())
-    requirements['id'] = req_id
+    requirements['id'] = str(uuid.uuid4())
     requirements['created_at'] = datetime.utcnow().isoformat()
-    DATABASE['requirements'].append(requirements)
+    return requirements
+
+# Doküman içeriğinin özeti (id ve oluşturulma zamanı hariç)
+# Aynı yapılandırma ve aynı katalog sürümü her zaman aynı özeti verir
+# Modül/servis seçimi sıra ve tekrar fark etmeksizin kanonik hale getirilir (sizing memo anahtarı gibi)
+def requirement_content_hash(requirements):
+    content = {key: value for key, value in requirements.items() if key not in ('id', 'created_at')}
+    for field in ('core_modules', 'auxiliary_services'):
+        content[field] = sorted({item['id'] for item in content.get(field, [])})
+    return hashlib.sha256(json.dumps(content, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+# Gereksinim dokümanı oluşturma
+# Aynı içerik daha önce oluşturulduysa yeni kayıt açılmaz, mevcut doküman döndürülür
+@api.route('/api/requirements/generate', methods=['POST'])
+@rate_limited('generate')
+def generate_requirements():
+    data = request.get_json()
+    
+    idempotency_key = request.headers.get('Idempotency-Key')
+    if idempotency_key is not None and not 0 < len(idempotency_key) <= IDEMPOTENCY_KEY_MAX_LENGTH:
+        return jsonify({'message': 'Geçersiz Idempotency-Key!'}), 400
+    
+    error = validate_requirement_config(data)
+    if error:
+        return jsonify(error[0]), error[1]
+    
+    # Gereksinim belgesi oluşturma ve kaydetme
+    requirements = build_requirement(data)
+    try:
+        requirements, created, replayed = REQUIREMENT_STORE.add_unique(
+            requirements,
+            requirement_content_hash(requirements),
+            idempotency_key,
+            now=time.time(),
+            key_ttl=IDEMPOTENCY_KEY_TTL,
+            dedup=REQUIREMENT_DEDUP
+        )
+    except IdempotencyConflict:
+        return jsonify({'message': 'Bu Idempotency-Key farklı bir istek için kullanılmış!'}), 422
+    
+    if created:
+        return jsonify({
+            'message': 'Gereksinim dokümanı başarıyla oluşturuldu.',
+            'requirementId': requirements['id'],
+            'requirements': requirements
+        }), 201
+    
+    # Aynı içerik veya aynı anahtarla tekrar deneme: mevcut doküman döndürülür
+    response = jsonify({
+        'message': 'Bu yapılandırma için daha önce oluşturulan doküman döndürüldü.',
+        'requirementId': requirements['id'],
+        'requirements': requirements,
+        'deduplicated': True
+    })
+    if replayed:
+        response.headers['Idempotent-Replayed'] = 'true'
+    return response, 200
+
+# Toplu gereksinim dokümanı oluşturma
+# Tüm yapılandırmalar önce doğrulanır, sonra tek transaction içinde kaydedilir
+@api.route('/api/requirements/batch', methods=['POST'])
+@rate_limited('generate')
+def generate_requirements_batch():
+    data = request.get_json()
+    configs = data.get('configs') if isinstance(data, dict) else data
+    
+    if not isinstance(configs, list) or not configs:
+        return jsonify({'message': 'configs alanı boş olmayan bir liste olmalıdır!'}), 400
+    
+    if len(configs) > BATCH_MAX_SIZE:
+        return jsonify({'message': f'Tek istekte en fazla {BATCH_MAX_SIZE} yapılandırma gönderilebilir!'}), 413
+    
+    errors = []
+    for index, config in enumerate(configs):
+        error = validate_requirement_config(config)
+        if error:
+            errors.append(dict(error[0], index=index))
+    
+    if errors:
+        return jsonify({'message': 'Bazı yapılandırmalar geçersiz!', 'errors': errors}), 400
+    
+    requirements_list = [build_requirement(config) for config in configs]
+    REQUIREMENT_STORE.add_many(requirements_list)
+    
+    results = [
+        {'index': index, 'requirementId': requirements['id'], 'requirements': requirements}
+        for index, requirements in enumerate(requirements_list)
+    ]
+    
+    # İstenirse sonuçlar NDJSON olarak satır satır gönderilir
+    if request.args.get('stream') == 'true' or 'application/x-ndjson' in request.headers.get('Accept', ''):
+        def generate():
+            for result in results:
+                yield json.dumps(result, ensure_ascii=False) + '\n'
+        return Response(generate(), status=201, mimetype='application/x-ndjson')
     
     return jsonify({
-        'message': 'Gereksinim dokümanı başarıyla oluşturuldu.',
-        'requirementId': req_id,
-        'requirements': requirements
+        'message': f'{len(results)} gereksinim dokümanı başarıyla oluşturuldu.',
+        'results': results
     }), 201
 
+# Export yanıtı (ETag ile birlikte)
+# Çıktı cache dosyasından servis edilir: Content-Length ve Range desteklenir,
+# gunicorn altında dosya sendfile ile kopyalanmadan gönderilir
+def export_response(path, req_id, fmt, etag):
+    response = send_file(
+        path,
+        mimetype=EXPORT_CONTENT_TYPES[fmt],
+        as_attachment=True,
+        download_name=f'CBOT_Kurulum_Gereksinimleri_{req_id}.{fmt}',
+        conditional=True,
+        etag=etag
+    )
+    response.headers['Cache-Control'] = 'private, max-age=0, must-revalidate'
+    return response
+
+# İstemcideki kopya güncelse 304 döndür
+def not_modified_response(etag):
+    response = make_response('', 304)
+    response.headers['Cache-Control'] = 'private, max-age=0, must-revalidate'
+    response.set_etag(etag)
+    return response
+
+# Export çıktısının cache anahtarı (aynı zamanda ETag)
+def export_cache_key(req_id, fmt):
+    return render_key(req_id, fmt, PDF_TEMPLATE_HASH if fmt == 'pdf' else DOCX_LAYOUT_VERSION)
+
+# Çıktının cache dosyasını döndür; yoksa doğrudan cache dosyasına render et
+# Render slotu yoksa Overloaded fırlatılır (wait=True ise slot beklenir)
+def render_export(requirement, fmt, wait=False):
+    key = export_cache_key(requirement['id'], fmt)
+    path = RENDER_CACHE.path(key)
+    if path is None:
+        with RENDER_SLOTS.slot(wait), EXPORTS_IN_FLIGHT.track(), RENDER_CACHE.writer(key) as f:
+            if fmt == 'pdf':
+                # HTML içeriğini hazırla ve PDF oluştur
+                with stage('render_template'):
+                    html_content = render_template('requirement_template.html', requirement=requirement)
+                render_pdf(html_content, f)
+            else:
+                # Word belgesi oluştur
+                render_docx(requirement, f)
+        path = RENDER_CACHE.written_path(key)
+    return path
+
 # PDF dokümanı indirme
-@app.route('/api/requirements/<req_id>/pdf', methods=['GET'])
+@api.route('/api/requirements/<req_id>/pdf', methods=['GET'])
+@rate_limited('export')
 def download_pdf(req_id):
+    return download_requirement(req_id, 'pdf')
+
+# Word dokümanı indirme
+@api.route('/api/requirements/<req_id>/docx', methods=['GET'])
+@rate_limited('export')
+def download_docx(req_id):
+    return download_requirement(req_id, 'docx')
+
+# Bulunamayan doküman: saklama politikasıyla silindiyse 410, hiç yoksa 404
+def requirement_not_found(req_id):
+    if REQUIREMENT_STORE.is_evicted(req_id):
+        return jsonify({'message': 'Gereksinim dokümanı saklama süresi dolduğu için silindi!'}), 410
+    return jsonify({'message': 'Gereksinim dokümanı bulunamadı!'}), 404
+
+def download_requirement(req_id, fmt):
     # Gereksinim dokümanını bul
-    requirement = next((r for r in DATABASE['requirements'] if r.get('id') == req_id), None)
+    requirement = REQUIREMENT_STORE.get(req_id)
     if not requirement:
-        return jsonify({'message': 'Gereksinim dokümanı bulunamadı!'}), 404
+        return requirement_not_found(req_id)
     
-    # HTML içeriğini hazırla
-    html_content = render_template(
-        'requirement_template.html',
-        requirement=requirement
-    )
+    etag = export_cache_key(req_id, fmt)
+    if request.if_none_match.contains(etag):
+        return not_modified_response(etag)
+    
+    try:
+        path = render_export(requirement, fmt)
+    except Overloaded as e:
+        return overloaded_response(e)
+    
+    return export_response(path, req_id, fmt, etag)
+
+# Birden fazla dokümanı tek ZIP arşivi olarak indirme
+# Dokümanlar paralel render edilir, her biri hazır olduğunda arşive eklenip gönderilir
+@api.route('/api/requirements/export.zip', methods=['GET'])
+def download_requirements_zip():
+    ids = [i for i in request.args.get('ids', '').split(',') if i]
+    formats = [f for f in request.args.get('formats', 'pdf').split(',') if f]
+    
+    if not ids:
+        return jsonify({'message': 'ids parametresi zorunludur!'}), 400
+    
+    if len(ids) > ZIP_EXPORT_MAX_IDS:
+        return jsonify({'message': f'Tek istekte en fazla {ZIP_EXPORT_MAX_IDS} doküman indirilebilir!'}), 413
     
-    # PDF oluştur
-    pdf_file = io.BytesIO()
-    HTML(string=html_content).write_pdf(pdf_file)
-    pdf_file.seek(0)
+    invalid_formats = [f for f in formats if f not in EXPORT_CONTENT_TYPES]
+    if not formats or invalid_formats:
+        return jsonify({'message': 'Geçersiz dosya formatı!'}), 400
     
-    # PDF'i indir
-    response = make_response(pdf_file.getvalue())
-    response.headers['Content-Type'] = 'application/pdf'
-    response.headers['Content-Disposition'] = f'attachment; filename=CBOT_Kurulum_Gereksinimleri_{req_id}.pdf'
+    # Her doküman/format çifti ayrı bir export sayılır; render slotu yoksa arşiv hiç başlatılmaz
+    try:
+        RATE_LIMITER.check('export', request.remote_addr, len(dict.fromkeys(ids)) * len(dict.fromkeys(formats)))
+        RENDER_SLOTS.check()
+    except Overloaded as e:
+        return overloaded_response(e)
+    
+    requirements_list = []
+    missing = []
+    for req_id in dict.fromkeys(ids):
+        requirement = REQUIREMENT_STORE.get(req_id)
+        if requirement:
+            requirements_list.append(requirement)
+        else:
+            missing.append(req_id)
     
+    if missing:
+        evicted = [req_id for req_id in missing if REQUIREMENT_STORE.is_evicted(req_id)]
+        return jsonify({
+            'message': 'Gereksinim dokümanı bulunamadı!',
+            'missing': missing,
+            'evicted': evicted
+        }), 410 if len(evicted) == len(missing) else 404
+    
+    app = current_app._get_current_object()
+    entries = [(requirement, fmt) for requirement in requirements_list for fmt in dict.fromkeys(formats)]
+    
+    # Render thread'lerinde şablon işleme için app context gerekir
+    # Cevap başlamış olduğu için render slotu reddedilmek yerine beklenir
+    def render_entry(requirement, fmt):
+        with app.app_context():
+            return render_export(requirement, fmt, wait=True)
+    
+    def generate():
+        archive = ZipStream()
+        pending = {}
+        errors = []
+        remaining = iter(entries)
+        try:
+            while True:
+                # Aynı anda en fazla ZIP_EXPORT_CONCURRENCY doküman render edilir
+                while len(pending) < ZIP_EXPORT_CONCURRENCY:
+                    entry = next(remaining, None)
+                    if entry is None:
+                        break
+                    pending[ZIP_EXECUTOR.submit(render_entry, *entry)] = entry
+                
+                if not pending:
+                    break
+                
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    requirement, fmt = pending.pop(future)
+                    filename = f"CBOT_Kurulum_Gereksinimleri_{requirement['id']}.{fmt}"
+                    try:
+                        path = future.result()
+                    except Exception as e:
+                        # Yanıt başlıkları gönderildiği için hata arşivde raporlanır
+                        logging.error(f"ZIP export error for {filename}: {str(e)}")
+                        errors.append(f'{filename}: {str(e)}')
+                        continue
+                    yield archive.add_file(filename, path)
+            
+            if errors:
+                yield archive.add('HATALAR.txt', '\n'.join(errors).encode('utf-8'))
+            yield archive.close()
+        finally:
+            # İstemci bağlantıyı kestiyse henüz başlamamış render'lar iptal edilir
+            for future in pending:
+                future.cancel()
+    
+    response = Response(generate(), mimetype='application/zip')
+    response.headers['Content-Disposition'] = 'attachment; filename=CBOT_Kurulum_Gereksinimleri.zip'
+    response.headers['Cache-Control'] = 'no-store'
     return response
 
-# Word dokümanı indirme
-@app.route('/api/requirements/<req_id>/docx', methods=['GET'])
-def download_docx(req_id):
-    # Gereksinim dokümanını bul
-    requirement = next((r for r in DATABASE['requirements'] if r.get('id') == req_id), None)
+# Export işi başlatma (render arka planda yapılır)
+@api.route('/api/requirements/<req_id>/exports', methods=['POST'])
+@rate_limited('export')
+def create_export(req_id):
+    requirement = REQUIREMENT_STORE.get(req_id)
     if not requirement:
-        return jsonify({'message': 'Gereksinim dokümanı bulunamadı!'}), 404
+        return requirement_not_found(req_id)
+    
+    data = request.get_json(silent=True) or {}
+    fmt = data.get('format', 'pdf')
+    if fmt not in EXPORT_CONTENT_TYPES:
+        return jsonify({'message': 'Geçersiz dosya formatı!'}), 400
     
-    # Word belgesi oluştur
-    doc = Document()
-    doc.add_heading('CBOT Kurulum Gereksinimleri', 0)
+    try:
+        if fmt == 'pdf':
+            # Şablon request thread'inde işlenir, PDF üretimi pool'da yapılır
+            with stage('render_template'):
+                html_content = render_template('requirement_template.html', requirement=requirement)
+            job = EXPORT_JOBS.submit(req_id, fmt, export_cache_key(req_id, fmt), render_pdf, html_content)
+        else:
+            job = EXPORT_JOBS.submit(req_id, fmt, export_cache_key(req_id, fmt), render_docx, requirement)
+    except ExportQueueFull:
+        response = jsonify({'message': 'Export kuyruğu dolu. Lütfen daha sonra tekrar deneyin.'})
+        response.headers['Retry-After'] = '5'
+        return response, 429
     
-    # Belge içeriğini doldur
-    add_requirement_content_to_docx(doc, requirement)
+    return jsonify(export_job_status(job)), 202
+
+# Export işi durumu
+@api.route('/api/exports/<job_id>', methods=['GET'])
+def get_export(job_id):
+    job = EXPORT_JOBS.get(job_id)
+    if not job:
+        return jsonify({'message': 'Export işi bulunamadı!'}), 404
+    
+    return jsonify(export_job_status(job)), 200
+
+# Tamamlanan export çıktısını indirme
+@api.route('/api/exports/<job_id>/download', methods=['GET'])
+def download_export(job_id):
+    job = EXPORT_JOBS.get(job_id)
+    if not job:
+        return jsonify({'message': 'Export işi bulunamadı!'}), 404
+    
+    if job['status'] != 'done':
+        return jsonify(export_job_status(job)), 409
+    
+    if request.if_none_match.contains(job['cache_key']):
+        return not_modified_response(job['cache_key'])
+    
+    path = RENDER_CACHE.path(job['cache_key'])
+    if path is None:
+        if REQUIREMENT_STORE.is_evicted(job['requirement_id']):
+            return requirement_not_found(job['requirement_id'])
+        return jsonify({'message': 'Export çıktısı bulunamadı!'}), 404
+    
+    return export_response(path, job['requirement_id'], job['format'], job['cache_key'])
+
+def export_job_status(job):
+    status = {
+        'jobId': job['id'],
+        'requirementId': job['requirement_id'],
+        'format': job['format'],
+        'status': job['status']
+    }
+    if job['status'] == 'done':
+        status['downloadUrl'] = f"/api/exports/{job['id']}/download"
+    if job['error']:
+        status['error'] = job['error']
+    return status
+
+# Modül, servis ve veritabanı kataloğu (frontend ve admin paneli için)
+# Gövde katalog sürümü başına bir kez serileştirilip sıkıştırılır; istemciler ETag ile doğrular
+@api.route('/api/catalog', methods=['GET'])
+def get_catalog():
+    encoding, body, etag = CATALOG.encoded().negotiate(request.accept_encodings)
+    
+    if request.if_none_match.contains(etag):
+        response = make_response('', 304)
+    else:
+        response = make_response(body)
+        response.mimetype = 'application/json'
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+    
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'public, max-age=0, must-revalidate'
+    response.vary.add('Accept-Encoding')
+    return response
+
+# Kapasite planlaması için tüm modül kombinasyonlarının donanım gereksinimleri
+@api.route('/api/sizing/matrix', methods=['GET'])
+def sizing_matrix():
+    environment = request.args.get('environment', 'both')
+    if environment not in ('test', 'live', 'both'):
+        return jsonify({'message': 'Geçersiz ortam seçimi!'}), 400
     
-    # Dosyayı kaydet
-    docx_file = io.BytesIO()
-    doc.save(docx_file)
-    docx_file.seek(0)
+    services = [s for s in request.args.get('services', '').split(',') if s]
+    unknown = [s for s in services if s not in SERVICE_INFO]
+    if unknown:
+        return jsonify({'message': f"Geçersiz servis seçimi: {', '.join(unknown)}"}), 400
     
-    # Word belgesini indir
-    response = make_response(docx_file.getvalue())
-    response.headers['Content-Type'] = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
-    response.headers['Content-Disposition'] = f'attachment; filename=CBOT_Kurulum_Gereksinimleri_{req_id}.docx'
+    catalog = CATALOG.sizing
+    rows = catalog.matrix(environment, catalog.service_mask(services))
     
-    return response
+    return jsonify({
+        'environment': environment,
+        'auxiliaryServices': services,
+        'modules': catalog.module_ids,
+        'combinations': [
+            {
+                'mask': mask,
+                'coreModules': catalog.module_ids_for(mask),
+                'hardware_requirements': hardware_requirements
+            }
+            for mask, hardware_requirements in rows
+        ]
+    }), 200
+
+# Sunucu tipi tanımlarını doğrula ve planlayıcı formatına çevir
+# Hata varsa (None, mesaj) döndürür
+def parse_node_shapes(nodes):
+    if not isinstance(nodes, list) or not nodes:
+        return None, 'nodes alanı boş olmayan bir liste olmalıdır!'
+    if len(nodes) > PLACEMENT_MAX_SHAPES:
+        return None, f'En fazla {PLACEMENT_MAX_SHAPES} sunucu tipi gönderilebilir!'
+    
+    shapes = []
+    for index, node in enumerate(nodes):
+        if not isinstance(node, dict):
+            return None, f'Geçersiz sunucu tipi: {index}'
+        name = str(node.get('name', f'node-{index + 1}'))
+        # Infinity/NaN (JSON'da kabul edilir) int()'e çevrilemez, maliyette de reddedilir
+        try:
+            capacity = tuple(int(node.get(field, 0)) for field in ('cpu', 'ram', 'disk', 'gpu_ram'))
+            cost = float(node.get('cost', capacity[0]))
+            count = node.get('count')
+            count = None if count is None else int(count)
+        except (TypeError, ValueError, OverflowError):
+            return None, f'Geçersiz sunucu tipi değerleri: {name}'
+        if min(capacity) < 0 or min(capacity[:3]) == 0 or not (math.isfinite(cost) and cost > 0) or (count is not None and count < 1):
+            return None, f'Geçersiz sunucu tipi değerleri: {name}'
+        shapes.append({'name': name, 'capacity': capacity, 'cost': cost, 'count': count})
+    return shapes, None
+
+# Seçilen modül/servislerin verilen sunucu tiplerine yerleşim planı
+# Test ve canlı bileşenleri ayrı sunuculara yerleştirilir
+@api.route('/api/sizing/placement', methods=['POST'])
+def sizing_placement():
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'message': 'Geçersiz istek içeriği!'}), 400
+    
+    environment = data.get('environment', 'both')
+    if environment not in ('test', 'live', 'both'):
+        return jsonify({'message': 'Geçersiz ortam seçimi!'}), 400
+    
+    catalog = CATALOG
+    modules = data.get('coreModules', [])
+    services = data.get('auxiliaryServices', [])
+    if not isinstance(modules, list) or not isinstance(services, list):
+        return jsonify({'message': 'Geçersiz modül/servis seçimi!'}), 400
+    if not all(isinstance(item_id, str) for item_id in modules + services):
+        return jsonify({'message': 'Modül/servis kimlikleri metin olmalıdır!'}), 400
+    unknown = [m for m in modules if m not in catalog.modules] + [s for s in services if s not in catalog.services]
+    if unknown:
+        return jsonify({'message': f"Geçersiz modül/servis seçimi: {', '.join(map(str, unknown))}"}), 400
+    
+    shapes, error = parse_node_shapes(data.get('nodes', DEFAULT_NODE_SHAPES))
+    if error:
+        return jsonify({'message': error}), 400
+    
+    # Aynı bileşen iki kez seçildiyse bir kez yerleştirilir
+    demands = component_demands(catalog.modules, catalog.services, environment,
+                                list(dict.fromkeys(modules)), list(dict.fromkeys(services)))
+    try:
+        with stage('placement'):
+            result = plan(demands, shapes, PLACEMENT_MAX_EXPANSIONS)
+    except PlacementError as e:
+        return jsonify({
+            'message': f"Şu bileşenler hiçbir sunucuya yerleştirilemedi: {', '.join(e.components)}",
+            'unplaced': e.components
+        }), 400
+    
+    result['environment'] = environment
+    result['catalog_version'] = catalog.version
+    return jsonify(result), 200
+
+# Cache istatistikleri
+@api.route('/api/admin/cache-stats', methods=['GET'])
+@token_required
+@admin_required
+def cache_stats(current_user):
+    return jsonify({
+        'catalog_version': CATALOG.version,
+        'sizing': SIZING_MEMO.stats(),
+        'render': RENDER_CACHE.stats(),
+        'renderers': {'pdf': PDF_RENDERERS.stats(), 'docx': DOCX_SKELETONS.stats()},
+        'auth': TOKEN_VERIFIER.stats(),
+        'retention': RETENTION_SWEEPER.stats(),
+        'admission': {
+            'rate_limits': RATE_LIMITER.stats(),
+            'render': RENDER_SLOTS.stats(),
+            'upstream': UPSTREAM_SLOTS.stats()
+        }
+    }), 200
+
+# Keyset sayfalama imleci: son kaydın (created_at, id) değeri
+def encode_cursor(requirement):
+    return base64.urlsafe_b64encode(json.dumps([requirement['created_at'], requirement['id']]).encode('utf-8')).decode('ascii')
+
+def decode_cursor(cursor):
+    try:
+        created_at, req_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(created_at, str) or not isinstance(req_id, str):
+        return None
+    return created_at, req_id
+
+def requirement_summary(requirement):
+    return {
+        'id': requirement['id'],
+        'created_at': requirement['created_at'],
+        'environment': requirement['environment'],
+        'environment_type': requirement['environment_type'],
+        'database': requirement.get('database'),
+        'core_modules': [module['id'] for module in requirement['core_modules']],
+        'auxiliary_services': [service['id'] for service in requirement['auxiliary_services']]
+    }
+
+# Oluşturulan gereksinim dokümanlarını listeleme ve filtreleme (en yeni önce)
+@api.route('/api/admin/requirements', methods=['GET'])
+@token_required
+@admin_required
+def list_requirements(current_user):
+    args = request.args
+    
+    try:
+        limit = int(args.get('limit', ADMIN_PAGE_SIZE))
+    except ValueError:
+        return jsonify({'message': 'limit bir tam sayı olmalıdır!'}), 400
+    if not 1 <= limit <= ADMIN_MAX_PAGE_SIZE:
+        return jsonify({'message': f'limit 1 ile {ADMIN_MAX_PAGE_SIZE} arasında olmalıdır!'}), 400
+    
+    # Filtre değerleri kontrolü
+    if args.get('environment') and args['environment'] not in ('test', 'live', 'both'):
+        return jsonify({'message': 'Geçersiz ortam seçimi!'}), 400
+    if args.get('database') and args['database'] not in DB_INFO:
+        return jsonify({'message': 'Geçersiz veritabanı seçimi!'}), 400
+    if args.get('module') and args['module'] not in MODULE_INFO:
+        return jsonify({'message': f"Geçersiz modül seçimi: {args['module']}"}), 400
+    if args.get('service') and args['service'] not in SERVICE_INFO:
+        return jsonify({'message': f"Geçersiz servis seçimi: {args['service']}"}), 400
+    
+    before = None
+    if args.get('cursor'):
+        before = decode_cursor(args['cursor'])
+        if before is None:
+            return jsonify({'message': 'Geçersiz sayfa imleci!'}), 400
+    
+    # Sonraki sayfanın olup olmadığını anlamak için bir kayıt fazla okunur
+    requirements_list = REQUIREMENT_STORE.find(
+        environment=args.get('environment'),
+        environment_type=args.get('environmentType'),
+        database=args.get('database'),
+        module=args.get('module'),
+        service=args.get('service'),
+        created_after=args.get('createdAfter'),
+        created_before=args.get('createdBefore'),
+        before=before,
+        limit=limit + 1
+    )
+    
+    next_cursor = encode_cursor(requirements_list[limit - 1]) if len(requirements_list) > limit else None
+    
+    return jsonify({
+        'requirements': [requirement_summary(requirement) for requirement in requirements_list[:limit]],
+        'nextCursor': next_cursor
+    }), 200
 
 # Admin paneli için modül yapılandırması güncelleme
-@app.route('/api/admin/modules/<module_id>', methods=['PUT'])
+@api.route('/api/admin/modules/<module_id>', methods=['PUT'])
 @token_required
 @admin_required
 def update_module(current_user, module_id):
@@ -423,16 +1367,36 @@ def update_module(current_user, module_id):
     data = request.get_json()
     
     # Güncellenebilir alanlar
-    updatable_fields = ['cpu_test', 'cpu_live', 'ram_test', 'ram_live', 'disk_test', 'disk_live', 'description']
+    numeric_fields = ['cpu_test', 'cpu_live', 'ram_test', 'ram_live', 'disk_test', 'disk_live']
+    updatable_fields = numeric_fields + ['description']
+    
+    # Kaynak değerleri tam sayı olmalıdır
+    for field in numeric_fields:
+        if field in data and (isinstance(data[field], bool) or not isinstance(data[field], int) or data[field] < 0):
+            return jsonify({'message': f'{field} alanı negatif olmayan bir tam sayı olmalıdır!'}), 400
+        if field in data and data[field] > MAX_RESOURCE_VALUE:
+            return jsonify({'message': f'{field} alanı en fazla {MAX_RESOURCE_VALUE} olabilir!'}), 422
+    
+    # Yeni katalog görüntüsü kaydetmeden önce derlenir; derlenemeyen değişiklik kalıcı hale gelmez
+    # (aksi halde sonraki tüm istekler ve yeniden başlatma aynı hatayla karşılaşır)
+    changes = {field: data[field] for field in updatable_fields if field in data}
+    version, overrides = CATALOG_STORE.load()
+    overrides.setdefault('module', {}).setdefault(module_id, {}).update(changes)
+    try:
+        CatalogSnapshot.build(MODULE_INFO, SERVICE_INFO, overrides, version + 1, DB_INFO)
+    except (OverflowError, ValueError, TypeError) as e:
+        logger.warning(f'Rejected catalog update for {module_id}: {e}')
+        return jsonify({'message': 'Modül değerleri katalogda kullanılamıyor!'}), 422
     
-    # Modül bilgilerini güncelle
-    for field in updatable_fields:
-        if field in data:
-            MODULE_INFO[module_id][field] = data[field]
+    # Modül bilgilerini kaydet, yeni katalog görüntüsünü oluştur ve yayınla
+    CATALOG_STORE.save_overrides('module', module_id, changes)
+    catalog = load_catalog()
+    swap_catalog(catalog)
     
     return jsonify({
         'message': 'Modül başarıyla güncellendi.',
-        'module': MODULE_INFO[module_id]
+        'module': dict(catalog.modules[module_id]),
+        'catalog_version': catalog.version
     }), 200
 
 # Gereksinim dokümanı oluşturma yardımcı fonksiyonu
@@ -445,10 +1409,11 @@ def generate_requirements_document(data):
     ldap_enabled = data.get('ldapEnabled', False)
     ldap_details = data.get('ldapDetails', {})
     
-    # Donanım gereksinimlerini hesapla
-    hardware_requirements = calculate_hardware_requirements(
-        environment, core_modules, auxiliary_services
-    )
+    # Doküman boyunca aynı katalog görüntüsü kullanılır
+    catalog = CATALOG
+    
+    # Seçime bağlı hesaplamalar (donanım, DNS, container, AI) memoize edilir
+    selection = compute_selection_requirements(catalog, environment, core_modules, auxiliary_services, database)
     
     # Veritabanı gereksinimlerini hazırla
     database_requirements = {
@@ -461,33 +1426,28 @@ def generate_requirements_document(data):
     network_requirements = {
         'internet_access': True,
         'db_port': DB_INFO[database]['port'],
-        'dns_records': generate_dns_records(environment, core_modules)
+        'dns_records': selection['dns_records']
     }
     
     # Docker gereksinimleri
     docker_requirements = {
         'registry': 'registry.cbot.ai',
         'port_access': 443,
-        'containers': []
+        'containers': selection['containers']
     }
     
-    # Container listesini oluştur
-    for module in core_modules:
-        docker_requirements['containers'].append(f'cbot-{module}')
-    
-    for service in auxiliary_services:
-        docker_requirements['containers'].append(f'cbot-{service.replace("_", "-")}')
-    
     # Gereksinim belgesini oluştur
     requirements_doc = {
         'environment': environment,
         'environment_type': environment_type,
-        'core_modules': [{'id': m, 'name': MODULE_INFO[m]['name']} for m in core_modules],
-        'auxiliary_services': [{'id': s, 'name': SERVICE_INFO[s]['name']} for s in auxiliary_services],
-        'hardware_requirements': hardware_requirements,
+        'database': database,
+        'core_modules': [{'id': m, 'name': catalog.modules[m]['name']} for m in core_modules],
+        'auxiliary_services': [{'id': s, 'name': catalog.services[s]['name']} for s in auxiliary_services],
+        'hardware_requirements': selection['hardware_requirements'],
         'database_requirements': database_requirements,
         'network_requirements': network_requirements,
         'docker_requirements': docker_requirements,
+        'catalog_version': catalog.version,
         'created_at': datetime.utcnow().isoformat()
     }
     
@@ -501,94 +1461,82 @@ def generate_requirements_document(data):
         }
     
     # AI Flow veya HF Model Hosting için ek gereksinimler
-    if 'aiflow' in core_modules or 'hf_model_hosting' in auxiliary_services:
-        requirements_doc['ai_requirements'] = []
-        
-        if 'aiflow' in core_modules:
-            requirements_doc['ai_requirements'].append({
-                'service': 'AI Flow',
-                'cpu_min': MODULE_INFO['aiflow']['cpu_test'],
-                'ram_min': MODULE_INFO['aiflow']['ram_test'],
-                'disk_min': MODULE_INFO['aiflow']['disk_test'],
-                'postgresql_disk': 4 if database == 'postgresql' else 0
-            })
-        
-        if 'hf_model_hosting' in auxiliary_services:
-            requirements_doc['ai_requirements'].append({
-                'service': 'HF Model Hosting',
-                'requires_gpu': True,
-                'gpu_ram': SERVICE_INFO['hf_model_hosting']['gpu_ram'],
-                'ram_min': SERVICE_INFO['hf_model_hosting']['ram_test']
-            })
+    if selection['ai_requirements']:
+        requirements_doc['ai_requirements'] = selection['ai_requirements']
     
     return requirements_doc
 
-# Donanım gereksinimlerini hesaplama
-def calculate_hardware_requirements(environment, core_modules, auxiliary_services):
-    # Başlangıç değerleri
-    test_requirements = {
-        'cpu': 4,  # Min CPU core
-        'ram': 8,  # Min RAM (GB)
-        'disk': 20,  # Min disk alanı (GB)
-        'gpu': False,  # GPU gereksinimi
-        'gpu_ram': 0  # GPU RAM gereksinimi (GB)
-    }
+# Seçime bağlı gereksinimler
+# Anahtar: katalog sürümü + ortam + modül/servis bitmask'i + veritabanı (seçim sırası önemsizdir)
+# Dönen nesneler dokümanlar arasında paylaşılır, değiştirilmemelidir
+def compute_selection_requirements(catalog, environment, core_modules, auxiliary_services, database):
+    sizing = catalog.sizing
+    module_mask = sizing.module_mask(core_modules)
+    service_mask = sizing.service_mask(auxiliary_services)
+    key = (catalog.version, environment, module_mask, service_mask, database)
+    
+    selection = SIZING_MEMO.get(key)
+    if selection is not None:
+        return selection
+    
+    modules = sizing.module_ids_for(module_mask)
+    services = sizing.service_ids_for(service_mask)
     
-    live_requirements = {
-        'cpu': 8,  # Min CPU core
-        'ram': 16,  # Min RAM (GB)
-        'disk': 40,  # Min disk alanı (GB)
-        'gpu': False,  # GPU gereksinimi
-        'gpu_ram': 0  # GPU RAM gereksinimi (GB)
+    # Container listesini oluştur
+    containers = [f'cbot-{module}' for module in modules]
+    containers += [f'cbot-{service.replace("_", "-")}' for service in services]
+    
+    ai_requirements = []
+    if 'aiflow' in modules:
+        ai_requirements.append({
+            'service': 'AI Flow',
+            'cpu_min': catalog.modules['aiflow']['cpu_test'],
+            'ram_min': catalog.modules['aiflow']['ram_test'],
+            'disk_min': catalog.modules['aiflow']['disk_test'],
+            'postgresql_disk': 4 if database == 'postgresql' else 0
+        })
+    
+    if 'hf_model_hosting' in services:
+        ai_requirements.append({
+            'service': 'HF Model Hosting',
+            'requires_gpu': True,
+            'gpu_ram': catalog.services['hf_model_hosting']['gpu_ram'],
+            'ram_min': catalog.services['hf_model_hosting']['ram_test']
+        })
+    
+    selection = {
+        'hardware_requirements': sizing.requirements(environment, module_mask, service_mask),
+        'dns_records': generate_dns_records(environment, modules),
+        'containers': containers,
+        'ai_requirements': ai_requirements
     }
-    
-    # Seçilen modüllere göre değerleri güncelle
-    for module in core_modules:
-        module_info = MODULE_INFO[module]
-        test_requirements['cpu'] += module_info['cpu_test'] - 2  # Baz değerden düşerek ekle
-        test_requirements['ram'] += module_info['ram_test'] - 4
-        test_requirements['disk'] += module_info['disk_test'] - 10
-        
-        live_requirements['cpu'] += module_info['cpu_live'] - 4
-        live_requirements['ram'] += module_info['ram_live'] - 8
-        live_requirements['disk'] += module_info['disk_live'] - 20
-    
-    # Seçilen yardımcı servislere göre değerleri güncelle
-    for service in auxiliary_services:
-        service_info = SERVICE_INFO[service]
-        test_requirements['cpu'] += service_info['cpu_test'] - 2
-        test_requirements['ram'] += service_info['ram_test'] - 4
-        test_requirements['disk'] += service_info['disk_test'] - 5
-        
-        live_requirements['cpu'] += service_info['cpu_live'] - 4
-        live_requirements['ram'] += service_info['ram_live'] - 8
-        live_requirements['disk'] += service_info['disk_live'] - 10
-        
-        # GPU gereksinimi kontrolü
-        if service_info.get('requires_gpu', False):
-            test_requirements['gpu'] = True
-            live_requirements['gpu'] = True
-            
-            gpu_ram = service_info.get('gpu_ram', 0)
-            test_requirements['gpu_ram'] = max(test_requirements['gpu_ram'], gpu_ram)
-            live_requirements['gpu_ram'] = max(live_requirements['gpu_ram'], gpu_ram)
-    
-    # Minimum değerlerin altında olmadığından emin ol
-    test_requirements['cpu'] = max(test_requirements['cpu'], 4)
-    test_requirements['ram'] = max(test_requirements['ram'], 8)
-    test_requirements['disk'] = max(test_requirements['disk'], 20)
-    
-    live_requirements['cpu'] = max(live_requirements['cpu'], 8)
-    live_requirements['ram'] = max(live_requirements['ram'], 16)
-    live_requirements['disk'] = max(live_requirements['disk'], 40)
-    
-    # Seçilen ortama göre sonuçları filtrele
-    if environment == 'test':
-        return {'test': test_requirements}
-    elif environment == 'live':
-        return {'live': live_requirements}
-    else:  # Her ikisi
-        return {'test': test_requirements, 'live': live_requirements}
+    SIZING_MEMO.set(key, selection)
+    return selection
+
+# Donanım gereksinimlerini hesaplama (derlenmiş katalog üzerinden)
+def calculate_hardware_requirements(environment, core_modules, auxiliary_services):
+    sizing = CATALOG.sizing
+    return sizing.requirements(
+        environment,
+        sizing.module_mask(core_modules),
+        sizing.service_mask(auxiliary_services)
+    )
+
+# Yeni katalog görüntüsünü yayınla (yalnızca daha yeni bir sürümse)
+# Sürüm değiştiği için eski memo kayıtları artık eşleşmez
+def swap_catalog(catalog):
+    global CATALOG
+    with _catalog_lock:
+        if catalog.version <= CATALOG.version:
+            return
+        CATALOG = catalog
+        SIZING_MEMO.clear()
+
+# Başka bir worker kataloğu değiştirdiyse yeni görüntüyü yükle
+@api.before_app_request
+def sync_catalog():
+    if CATALOG_STORE.version() != CATALOG.version:
+        swap_catalog(load_catalog())
 
 # DNS kayıtları oluşturma
 def generate_dns_records(environment, core_modules):
@@ -627,188 +1575,32 @@ def generate_dns_records(environment, core_modules):
     
     return dns_records
 
-# Word belgesi içeriğini oluşturma
-def add_requirement_content_to_docx(doc, requirement):
-    # Belge başlığı ve tarihi
-    doc.add_paragraph(f"Oluşturulma Tarihi: {datetime.fromisoformat(requirement['created_at']).strftime('%d.%m.%Y %H:%M')}")
-    doc.add_heading('1. Ortam Bilgileri', level=1)
-    
-    # Ortam bilgileri
-    environment_text = ''
-    if requirement['environment'] == 'both':
-        environment_text = 'Test ve Canlı'
-    elif requirement['environment'] == 'test':
-        environment_text = 'Test'
-    else:
-        environment_text = 'Canlı'
-    
-    environment_type_text = 'On-Premise' if requirement['environment_type'] == 'on-prem' else 'Bulut'
-    
-    p = doc.add_paragraph()
-    p.add_run('Ortam Tipi: ').bold = True
-    p.add_run(environment_text)
-    
-    p = doc.add_paragraph()
-    p.add_run('Kurulum Ortamı: ').bold = True
-    p.add_run(environment_type_text)
-    
-    # Seçilen modüller
-    doc.add_heading('2. Seçilen Modüller', level=1)
-    for module in requirement['core_modules']:
-        doc.add_paragraph(module['name'], style='List Bullet')
-    
-    # Yardımcı servisler
-    if requirement['auxiliary_services']:
-        doc.add_heading('Yardımcı Servisler:', level=2)
-        for service in requirement['auxiliary_services']:
-            doc.add_paragraph(service['name'], style='List Bullet')
-    
-    # Donanım gereksinimleri
-    doc.add_heading('3. Donanım Gereksinimleri', level=1)
-    
-    hardware_table = doc.add_table(rows=1, cols=6)
-    hardware_table.style = 'Table Grid'
-    
-    # Tablo başlıkları
-    header_cells = hardware_table.rows[0].cells
-    header_cells[0].text = 'Ortam'
-    header_cells[1].text = 'CPU'
-    header_cells[2].text = 'RAM'
-    header_cells[3].text = 'Disk'
-    header_cells[4].text = 'GPU'
-    header_cells[5].text = 'OS'
-    
-    # Tablo içeriği
-    hw_requirements = requirement['hardware_requirements']
-    
-    if 'test' in hw_requirements:
-        row_cells = hardware_table.add_row().cells
-        row_cells[0].text = 'Test'
-        row_cells[1].text = f"{hw_requirements['test']['cpu']} Core"
-        row_cells[2].text = f"{hw_requirements['test']['ram']} GB"
-        row_cells[3].text = f"{hw_requirements['test']['disk']} GB"
-        row_cells[4].text = "Gerekmiyor" if not hw_requirements['test']['gpu'] else f"{hw_requirements['test']['gpu_ram']} GB VRAM"
-        row_cells[5].text = "CentOS 7/8 veya RHEL"
-    
-    if 'live' in hw_requirements:
-        row_cells = hardware_table.add_row().cells
-        row_cells[0].text = 'Canlı'
-        row_cells[1].text = f"{hw_requirements['live']['cpu']} Core"
-        row_cells[2].text = f"{hw_requirements['live']['ram']} GB"
-        row_cells[3].text = f"{hw_requirements['live']['disk']} GB"
-        row_cells[4].text = "Gerekmiyor" if not hw_requirements['live']['gpu'] else f"{hw_requirements['live']['gpu_ram']} GB VRAM"
-        row_cells[5].text = "CentOS 7/8 veya RHEL"
-    
-    # Veritabanı gereksinimleri
-    doc.add_heading('4. Veritabanı Gereksinimleri', level=1)
-    
-    p = doc.add_paragraph()
-    p.add_run('Veritabanı Tipi: ').bold = True
-    p.add_run(requirement['database_requirements']['type'])
-    
-    p = doc.add_paragraph()
-    p.add_run('Kullanıcı: ').bold = True
-    p.add_run('OWNER yetkili kullanıcı')
-    
-    if requirement['database_requirements']['collation']:
-        p = doc.add_paragraph()
-        p.add_run('Collation: ').bold = True
-        p.add_run(requirement['database_requirements']['collation'])
-    
-    p = doc.add_paragraph()
-    p.add_run('Port: ').bold = True
-    p.add_run(str(requirement['database_requirements']['port']))
-    
-    doc.add_paragraph('IP ve port paylaşımı zorunludur')
-    
-    # Network/Firewall gereksinimleri
-    doc.add_heading('5. Network / Firewall Gereksinimleri', level=1)
-    doc.add_paragraph('Sunucular internet erişimli olmalıdır', style='List Bullet')
-    doc.add_paragraph(f"Veritabanı portları açık olmalıdır ({requirement['database_requirements']['port']})", style='List Bullet')
-    doc.add_paragraph('Load Balancer 5000 portunda WebSocket desteği sağlamalıdır', style='List Bullet')
-    
-    doc.add_heading('DNS Kayıtları:', level=2)
-    dns_table = doc.add_table(rows=1, cols=3)
-    dns_table.style = 'Table Grid'
-    
-    # DNS tablosu başlıkları
-    dns_header = dns_table.rows[0].cells
-    dns_header[0].text = 'Servis'
-    dns_header[1].text = 'DNS Kaydı'
-    dns_header[2].text = 'Port'
-    
-    # DNS tablosu içeriği
-    for record in requirement['network_requirements']['dns_records']:
-        row_cells = dns_table.add_row().cells
-        row_cells[0].text = record['service'].split('-')[1].capitalize() + (' (Test)' if record['service'].endswith('-test') else '')
-        row_cells[1].text = record['service']
-        row_cells[2].text = f"{record['port']}{' (WebSocket)' if record.get('websocket', False) else ''}"
-    
-    # Docker Image ve Registry
-    doc.add_heading('6. Docker Image ve Registry', level=1)
-    doc.add_paragraph('Tüm servis image\'ları registry.cbot.ai adresinden çekilir', style='List Bullet')
-    doc.add_paragraph('Sunucular 443 portundan bu adrese erişebilmelidir', style='List Bullet')
-    
-    doc.add_heading('Gerekli Containerlar:', level=2)
-    for container in requirement['docker_requirements']['containers']:
-        doc.add_paragraph(container, style='List Bullet')
-    
-    # LDAP Gereksinimleri (varsa)
-    section_count = 7
-    if 'ldap_requirements' in requirement:
-        doc.add_heading(f'{section_count}. LDAP Gereksinimleri', level=1)
-        
-        p = doc.add_paragraph()
-        p.add_run('LDAP URL: ').bold = True
-        p.add_run(requirement['ldap_requirements']['url'] or 'Belirtilmedi')
-        
-        p = doc.add_paragraph()
-        p.add_run('BIND DN: ').bold = True
-        p.add_run(requirement['ldap_requirements']['bind_dn'] or 'Belirtilmedi')
-        
-        p = doc.add_paragraph()
-        p.add_run('SEARCH BASE: ').bold = True
-        p.add_run(requirement['ldap_requirements']['search_base'] or 'Belirtilmedi')
-        
-        p = doc.add_paragraph()
-        p.add_run('SEARCH FILTER: ').bold = True
-        p.add_run(requirement['ldap_requirements']['search_filter'] or 'Belirtilmedi')
-        
-        doc.add_paragraph('Email, Role, Name field\'ları mapping yapılmalıdır.')
-        doc.add_paragraph('Rollerin panelde LDAP ile birebir eşleşmesi gerekmektedir.')
-        
-        section_count += 1
-    
-    # AI Servisleri Ek Gereksinimleri (varsa)
-    if 'ai_requirements' in requirement:
-        doc.add_heading(f'{section_count}. AI Servisleri Ek Gereksinimleri', level=1)
-        
-        for ai_req in requirement['ai_requirements']:
-            doc.add_heading(f"{ai_req['service']} Gereksinimleri:", level=2)
-            
-            if ai_req['service'] == 'AI Flow':
-                doc.add_paragraph(f"Minimum {ai_req['cpu_min']} Core CPU, {ai_req['ram_min']} GB RAM", style='List Bullet')
-                if ai_req.get('postgresql_disk', 0) > 0:
-                    doc.add_paragraph(f"{ai_req['postgresql_disk']} GB disk alanı (PostgreSQL)", style='List Bullet')
-            
-            if ai_req['service'] == 'HF Model Hosting':
-                doc.add_paragraph('GPU destekli sunucu', style='List Bullet')
-                doc.add_paragraph(f"Minimum {ai_req['gpu_ram']} GB VRAM", style='List Bullet')
-                doc.add_paragraph(f"Minimum {ai_req['ram_min']} GB sistem RAM", style='List Bullet')
-        
-        section_count += 1
-    
-    # Kurulum Topolojisi
-    doc.add_heading(f'{section_count}. Kurulum Topolojisi', level=1)
-    doc.add_paragraph('Kurulum topolojisi görsel temsili AI asistan tarafından oluşturulmuştur.')
-    
-    # Doküman sonunda yasal uyarı
-    doc.add_paragraph()
-    doc.add_paragraph('Bu doküman CBOT tarafından otomatik olarak oluşturulmuştur. Detaylı bilgi için teknik ekibimizle iletişime geçebilirsiniz.')
+# Uygulama fabrikası (gunicorn wsgi.py ve geliştirme sunucusu tarafından kullanılır)
+def create_app():
+    app = Flask(__name__, static_folder='static', template_folder='templates')
+    CORS(app)  # Cross-Origin Resource Sharing etkinleştir
+    
+    # Uygulama konfigürasyonu
+    app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'cbot-secret-key-change-in-production')
+    app.config['JWT_EXPIRATION'] = 3600  # Token süresi (saniye)
+    
+    # nginx arkasında istemci IP'si X-Forwarded-For'dan alınır (hız limitleri için)
+    proxy_count = int(os.environ.get('TRUSTED_PROXY_COUNT', 0))
+    if proxy_count:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=proxy_count, x_proto=proxy_count)
+    
+    app.register_blueprint(api)
+    return app
+
+app = create_app()
 
 # Ana uygulamayı başlat
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
     debug = os.environ.get('DEBUG', 'False').lower() == 'true'
     
-    app.run(host='0.0.0.0', port=port, debug=debug)
\ No newline at end of file
+    if GEVENT_ENABLED:
+        from gevent.pywsgi import WSGIServer
+        WSGIServer(('0.0.0.0', port), app).serve_forever()
+    else:
+        app.run(host='0.0.0.0', port=port, debug=debug)
\ No newline at end of file
@@ -0,0 +1,101 @@
+import json
+import os
+import resource
+import sys
+import tempfile
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCHMARK_DIR)
+BASELINE_PATH = os.path.join(BENCHMARK_DIR, 'baseline.json')
+
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+
+# Uygulama import edilmeden önce çağrılmalı: veritabanı, cache ve metrik dosyaları
+# geçici bir dizine yazılır, chatbot istekleri yerel mock webhook'a gider
+def prepare_environment(webhook_url):
+    work_dir = tempfile.mkdtemp(prefix='cbot-bench-')
+    os.environ['REQUIREMENTS_DB_PATH'] = os.path.join(work_dir, 'requirements.db')
+    os.environ['RENDER_CACHE_DIR'] = os.path.join(work_dir, 'renders')
+    os.environ['METRICS_DIR'] = os.path.join(work_dir, 'metrics')
+    os.environ['CBOT_WEBHOOK_URL'] = webhook_url
+    # Ham throughput ölçülür: tek istemciden gelen yük hız limitine ve render sınırına takılmamalı
+    os.environ.setdefault('RATE_LIMIT_ENABLED', 'false')
+    os.environ.setdefault('MAX_INFLIGHT_RENDERS', '1000')
+    return work_dir
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, int(round(q / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+# Süre örneklerinden (saniye) özet
+def summarize(durations, elapsed):
+    return {
+        'count': len(durations),
+        'ops_per_sec': len(durations) / elapsed if elapsed else 0.0,
+        'p50_ms': percentile(durations, 50) * 1000,
+        'p99_ms': percentile(durations, 99) * 1000
+    }
+
+
+# Process'in şu ana kadarki en yüksek bellek kullanımı (MB)
+def peak_rss_mb():
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux KB, macOS bayt döndürür
+    return max_rss / (1024 * 1024) if sys.platform == 'darwin' else max_rss / 1024
+
+
+def load_baseline(path=BASELINE_PATH):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(results, path=BASELINE_PATH):
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+# Sonuçları baseline ile karşılaştır; p50/p99 artışı veya throughput düşüşü
+# threshold oranını geçerse gerileme sayılır
+def compare(results, baseline, threshold):
+    rows = []
+    for name in sorted(results):
+        current = results[name]
+        previous = baseline.get(name) if baseline else None
+        regressions = []
+        if previous:
+            for field in ('p50_ms', 'p99_ms'):
+                if previous.get(field) and current[field] > previous[field] * (1 + threshold):
+                    regressions.append(field)
+            if previous.get('ops_per_sec') and current['ops_per_sec'] < previous['ops_per_sec'] * (1 - threshold):
+                regressions.append('ops_per_sec')
+        rows.append((name, current, previous, regressions))
+    return rows
+
+
+def _change(current, previous, field):
+    if not previous or not previous.get(field):
+        return ''
+    return f'{(current[field] / previous[field] - 1) * 100:+.0f}%'
+
+
+def print_report(rows):
+    print(f"{'Benchmark':<52}{'ops/s':>11}{'p50 ms':>10}{'p99 ms':>10}{'Δops':>7}{'Δp50':>7}{'Δp99':>7}")
+    for name, current, previous, regressions in rows:
+        line = (
+            f"{name:<52}{current['ops_per_sec']:>11.1f}{current['p50_ms']:>10.3f}{current['p99_ms']:>10.3f}"
+            f"{_change(current, previous, 'ops_per_sec'):>7}{_change(current, previous, 'p50_ms'):>7}"
+            f"{_change(current, previous, 'p99_ms'):>7}"
+        )
+        if regressions:
+            line += '  GERİLEME: ' + ', '.join(regressions)
+        print(line)
@@ -0,0 +1,135 @@
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from common import BACKEND_DIR
+
+# Uçtan uca yük testi
+# Varsayılan olarak uygulama repodaki gunicorn.conf.py ile ayrı bir gunicorn sürecinde başlatılır
+# (production yolu: pre-fork, gthread worker'lar). --server dev ile aynı process'te werkzeug
+# geliştirme sunucusu kullanılır; bu sonuçlar 'load-dev.' önekiyle ayrı tutulur ve production
+# yolunu temsil etmez. --url ile çalışan bir sunucu hedeflenebilir; bu durumda sunucunun
+# CBOT_WEBHOOK_URL değeri mock_aiflow.py'ye yönlendirilmelidir.
+# İstemci aynı makinede çalışır; mutlak değerler yerine sürümler arası karşılaştırma için kullanılmalıdır.
+
+CONFIGS = [
+    {'environment': 'test', 'environmentType': 'on-prem', 'coreModules': ['core'], 'auxiliaryServices': [], 'database': 'mssql'},
+    {'environment': 'live', 'environmentType': 'cloud', 'coreModules': ['core', 'panel', 'livechat'], 'auxiliaryServices': ['ocr'], 'database': 'postgresql'},
+    {'environment': 'both', 'environmentType': 'on-prem', 'coreModules': ['core', 'panel', 'aiflow', 'classifier', 'analytics'],
+     'auxiliaryServices': ['hf_model_hosting', 'ocr'], 'database': 'mssql', 'ldapEnabled': True}
+]
+
+
+# Geliştirme sunucusu (yalnızca --server dev)
+def start_app(app):
+    from werkzeug.serving import make_server
+    server = make_server('127.0.0.1', 0, app.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}'
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+# gunicorn'u repodaki yapılandırmayla başlat, uygulama istek kabul edene kadar bekle
+# Ortam değişkenleri (veritabanı, mock webhook, limitler) bu process'ten devralınır
+def start_gunicorn(workers=None, timeout=60):
+    port = _free_port()
+    env = dict(os.environ, PORT=str(port))
+    if workers:
+        env['WEB_CONCURRENCY'] = str(workers)
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '--bind', f'127.0.0.1:{port}', 'wsgi:app'],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL  # erişim logu; hatalar stderr'de görünür
+    )
+    base_url = f'http://127.0.0.1:{port}'
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'gunicorn başlatılamadı (çıkış kodu {process.returncode})')
+        try:
+            requests.get(f'{base_url}/api/catalog', timeout=1)
+            return process, base_url
+        except requests.RequestException:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError('gunicorn zamanında hazır olmadı')
+
+
+def stop_gunicorn(process):
+    process.terminate()
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+# Export senaryoları için önceden doküman oluştur (her istek farklı dokümanı render eder)
+def create_requirements(base_url, count, batch_size=100):
+    ids = []
+    while len(ids) < count:
+        size = min(batch_size, count - len(ids))
+        configs = [CONFIGS[(len(ids) + i) % len(CONFIGS)] for i in range(size)]
+        response = requests.post(f'{base_url}/api/requirements/batch', json={'configs': configs}, timeout=60)
+        response.raise_for_status()
+        ids += [result['requirementId'] for result in response.json()['results']]
+    return ids
+
+
+def scenarios(base_url, total):
+    ids = create_requirements(base_url, total * 2)
+    docx_ids, pdf_ids = ids[:total], ids[total:]
+    return {
+        'generate': lambda i: ('POST', '/api/requirements/generate', CONFIGS[i % len(CONFIGS)]),
+        'docx.cold': lambda i: ('GET', f'/api/requirements/{docx_ids[i]}/docx', None),
+        'docx.cached': lambda i: ('GET', f'/api/requirements/{docx_ids[0]}/docx', None),
+        'pdf.cold': lambda i: ('GET', f'/api/requirements/{pdf_ids[i]}/pdf', None),
+        'pdf.cached': lambda i: ('GET', f'/api/requirements/{pdf_ids[0]}/pdf', None),
+        # Her mesaj farklı: cevap cache'i atlanır, istek mock webhook'a gider
+        'chatbot.message': lambda i: ('POST', '/api/chatbot/message', {'message': f'Benchmark sorusu {i}'}),
+        'chatbot.message.cached': lambda i: ('POST', '/api/chatbot/message', {'message': 'Benchmark sorusu'})
+    }
+
+
+def run_scenario(base_url, make_request, total, concurrency):
+    local = threading.local()
+    errors = []
+
+    def call(i):
+        session = getattr(local, 'session', None)
+        if session is None:
+            session = local.session = requests.Session()
+        method, path, body = make_request(i)
+        start = time.perf_counter()
+        response = session.request(method, base_url + path, json=body, timeout=120)
+        response.content
+        duration = time.perf_counter() - start
+        if response.status_code >= 400:
+            errors.append(response.status_code)
+        return duration
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        durations = list(executor.map(call, range(total)))
+    return durations, time.perf_counter() - started, errors
+
+
+def run(base_url, total=200, concurrency=8, only=None, prefix='load'):
+    from common import summarize
+
+    results = {}
+    for name, make_request in scenarios(base_url, total).items():
+        if only and name not in only:
+            continue
+        durations, elapsed, errors = run_scenario(base_url, make_request, total, concurrency)
+        results[f'{prefix}.{name}'] = dict(summarize(durations, elapsed), errors=len(errors), concurrency=concurrency)
+    return results
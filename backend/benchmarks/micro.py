@@ -0,0 +1,64 @@
+import time
+
+# Sıcak yoldaki fonksiyonların farklı modül seçimi boyutlarında ölçümü
+# Her çağrı ayrı ölçülür; min_time saniye veya max_calls çağrı sonunda durulur
+# setup ölçüm dışında çalışır, döndürdüğü değerler (varsa) fonksiyona argüman olarak verilir
+
+MODULE_SET_SIZES = (1, 3, 5, 7)
+
+
+def measure(func, setup=None, min_time=0.5, max_calls=20000):
+    durations = []
+    started = time.perf_counter()
+    while len(durations) < max_calls and time.perf_counter() - started < min_time:
+        args = (setup() if setup else None) or ()
+        start = time.perf_counter()
+        func(*args)
+        durations.append(time.perf_counter() - start)
+    return durations, sum(durations)
+
+
+def selection(app, size):
+    modules = list(app.MODULE_INFO)[:size]
+    services = list(app.SERVICE_INFO)[:size // 2]
+    config = {
+        'environment': 'both',
+        'environmentType': 'on-prem',
+        'coreModules': modules,
+        'auxiliaryServices': services,
+        'database': 'mssql',
+        'ldapEnabled': True,
+        'ldapDetails': {'url': 'ldap://ldap.example.com'}
+    }
+    return modules, services, config
+
+
+def run(app, min_time=0.5):
+    from exporters import add_requirement_content_to_docx, DocxSkeleton
+    from common import summarize
+
+    results = {}
+    skeleton = DocxSkeleton()
+
+    def record(name, size, func, setup=None):
+        durations, elapsed = measure(func, setup, min_time)
+        results[f'micro.{name}[{size}]'] = summarize(durations, elapsed)
+
+    for size in MODULE_SET_SIZES:
+        modules, services, config = selection(app, size)
+        requirement = app.build_requirement(config)
+
+        record('calculate_hardware_requirements', size,
+               lambda: app.calculate_hardware_requirements('both', modules, services))
+        record('generate_dns_records', size,
+               lambda: app.generate_dns_records('both', modules))
+        record('generate_requirements_document', size,
+               lambda: app.generate_requirements_document(config))
+        # Memo boşken (katalog değişikliği sonrası ilk istek)
+        record('generate_requirements_document.cold', size,
+               lambda: app.generate_requirements_document(config), app.SIZING_MEMO.clear)
+        record('add_requirement_content_to_docx', size,
+               lambda doc: add_requirement_content_to_docx(doc, requirement, skeleton),
+               lambda: (skeleton.new_document(),))
+
+    return results
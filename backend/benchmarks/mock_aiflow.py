@@ -0,0 +1,54 @@
+import argparse
+import json
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# AIFlow webhook'unun yerel taklidi (ağ erişimi olmadan chatbot yükü ölçmek için)
+# Her isteğe latency saniye bekleyip AIFlow formatında ([{"output": ...}]) cevap verir
+#   python benchmarks/mock_aiflow.py --port 5999 --latency 0.05
+
+
+class MockAIFlowHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    latency = 0.0
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        message = json.loads(self.rfile.read(length) or b'{}').get('message', '')
+        if self.latency:
+            time.sleep(self.latency)
+
+        body = json.dumps([{'output': f'Mock cevap: {message}'}], ensure_ascii=False).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+# Arka planda çalışan mock sunucuyu başlat, (sunucu, webhook adresi) döndür
+def start(port=0, latency=0.0):
+    handler = type('Handler', (MockAIFlowHandler,), {'latency': latency})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}/webhook'
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Yerel AIFlow webhook taklidi')
+    parser.add_argument('--port', type=int, default=5999)
+    parser.add_argument('--latency', type=float, default=0.05, help='cevap gecikmesi (saniye)')
+    args = parser.parse_args()
+
+    server, url = start(args.port, args.latency)
+    print(f'Mock AIFlow webhook: {url}')
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,93 @@
+import argparse
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import common
+import mock_aiflow
+
+# Backend benchmark'ları (ağ erişimi gerektirmez)
+#   python benchmarks/run.py                    # micro + load, baseline ile karşılaştır
+#   python benchmarks/run.py --suite micro
+#   python benchmarks/run.py --save-baseline    # sonuçları baseline.json'a yaz
+#   python benchmarks/run.py --suite load --url http://127.0.0.1:5000
+#   python benchmarks/run.py --suite load --server dev   # gunicorn yerine aynı process'te werkzeug
+# Yük testi varsayılan olarak gunicorn.conf.py ile başlatılan gunicorn'a karşı çalışır;
+# dev sunucusu sonuçları 'load-dev.' önekiyle raporlanır ve production'ı temsil etmez.
+# Baseline makineye özeldir; karşılaştırmalar aynı ortamda alınmış sonuçlarla yapılmalıdır.
+# Gerileme bulunursa çıkış kodu 1 olur.
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CBOT backend benchmark')
+    parser.add_argument('--suite', choices=('micro', 'load', 'all'), default='all')
+    parser.add_argument('--url', help='yük testi için çalışan sunucu adresi (varsayılan: yeni gunicorn süreci)')
+    parser.add_argument('--server', choices=('gunicorn', 'dev'), default='gunicorn',
+                        help='--url verilmezse başlatılacak sunucu (dev: aynı process, werkzeug)')
+    parser.add_argument('--workers', type=int, help='gunicorn worker sayısı (varsayılan: gunicorn.conf.py)')
+    parser.add_argument('--requests', type=int, default=200, help='senaryo başına istek sayısı')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--scenario', action='append', help='yalnızca bu yük senaryolarını çalıştır')
+    parser.add_argument('--min-time', type=float, default=0.5, help='micro benchmark başına süre (saniye)')
+    parser.add_argument('--webhook-latency', type=float, default=0.02, help='mock AIFlow gecikmesi (saniye)')
+    parser.add_argument('--threshold', type=float, default=0.2, help='gerileme eşiği (0.2 = %%20)')
+    parser.add_argument('--baseline', default=common.BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true')
+    args = parser.parse_args()
+
+    _, webhook_url = mock_aiflow.start(latency=args.webhook_latency)
+    common.prepare_environment(webhook_url)
+    logging.disable(logging.INFO)
+
+    # Micro benchmark'lar ve dev sunucusu uygulamayı bu process'te çalıştırır
+    in_process = args.suite != 'load' or (not args.url and args.server == 'dev')
+    if in_process:
+        import app
+
+    results = {}
+    if args.suite in ('micro', 'all'):
+        import micro
+        results.update(micro.run(app, args.min_time))
+
+    if args.suite in ('load', 'all'):
+        import load
+        base_url = args.url
+        prefix = 'load'
+        server = None
+        if not base_url and args.server == 'dev':
+            _, base_url = load.start_app(app)
+            prefix = 'load-dev'
+        elif not base_url:
+            server, base_url = load.start_gunicorn(args.workers)
+        try:
+            results.update(load.run(base_url, args.requests, args.concurrency, args.scenario, prefix))
+        finally:
+            if server is not None:
+                load.stop_gunicorn(server)
+
+    baseline = common.load_baseline(args.baseline)
+    rows = common.compare(results, baseline, args.threshold)
+    common.print_report(rows)
+    if in_process:
+        print(f'\nMaks RSS (benchmark process): {common.peak_rss_mb():.1f} MB')
+
+    if args.save_baseline:
+        common.save_baseline(dict(baseline or {}, **results), args.baseline)
+        print(f'Baseline kaydedildi: {args.baseline}')
+        return 0
+
+    if baseline is None:
+        print('\nBaseline bulunamadı; oluşturmak için --save-baseline kullanın.')
+        return 0
+
+    regressions = [name for name, _, _, found in rows if found]
+    if regressions:
+        print(f"\n{len(regressions)} benchmark'ta gerileme var (eşik %{args.threshold * 100:.0f}).")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
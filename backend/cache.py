@@ -0,0 +1,224 @@
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+# Render çıktıları için içerik adresli anahtar (aynı zamanda ETag olarak kullanılır)
+def render_key(req_id, fmt, template_hash):
+    return hashlib.sha256(f'{req_id}:{fmt}:{template_hash}'.encode('utf-8')).hexdigest()[:32]
+
+
+# Dosya içeriklerinin özeti (şablon değişince cache anahtarları da değişir)
+# Var olmayan dosyalar atlanır
+def file_hash(*paths):
+    digest = hashlib.sha256()
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(65536), b''):
+                digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+# PDF/DOCX çıktıları için boyut sınırlı disk cache'i
+# İndirmeler dosyadan (sendfile ile) servis edilir; diğer worker'ların ürettiği çıktılar da kullanılır
+# Toplam boyut max_bytes'ı aşınca en uzun süredir kullanılmayan dosyalar silinir
+# (isabetlerde dosyanın mtime'ı güncellenir, böylece sıralama tüm worker'lar için geçerlidir)
+class RenderCache:
+    TMP_PREFIX = '.tmp-'
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024):
+        self.directory = os.path.abspath(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key)
+
+    # Çıktıyı geçici dosyaya yazdırır, başarılı olursa atomik olarak cache'e taşır
+    @contextmanager
+    def writer(self, key):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=self.TMP_PREFIX)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                yield f
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self._enforce_limit()
+
+    # Cache dosyasının yolu, yoksa None
+    def path(self, key):
+        path = self._path(key)
+        try:
+            os.utime(path)
+            exists = True
+        except FileNotFoundError:
+            exists = False
+        with self._lock:
+            if exists:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return path if exists else None
+
+    # Yeni yazılan çıktının yolu (isabet sayaçlarını etkilemez)
+    def written_path(self, key):
+        return self._path(key)
+
+    def put(self, key, data):
+        if os.path.exists(self._path(key)):
+            return
+        with self.writer(key) as f:
+            f.write(data)
+
+    # Çıktıyı sil
+    def discard(self, key):
+        try:
+            os.unlink(self._path(key))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _entries(self):
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                try:
+                    if entry.is_file() and not entry.name.startswith(self.TMP_PREFIX):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.name))
+                except FileNotFoundError:
+                    continue
+        return entries
+
+    # Belirli bir zamandan önce kullanılmış dosyaları sil (eski şablonlara ait yetim çıktılar dahil)
+    def discard_older_than(self, timestamp):
+        return sum(self.discard(name) for mtime, _, name in self._entries() if mtime < timestamp)
+
+    # Sınır aşıldıysa en eski dosyalardan başlayarak sil
+    # Dizin her yazmada taranır; böylece diğer worker'ların yazdıkları da hesaba katılır
+    def _enforce_limit(self):
+        entries = self._entries()
+        size = sum(entry[1] for entry in entries)
+        if size <= self.max_bytes:
+            return
+        evicted = 0
+        for _, file_size, name in sorted(entries):
+            if size <= self.max_bytes:
+                break
+            if self.discard(name):
+                evicted += 1
+            size -= file_size
+        with self._lock:
+            self.evictions += evicted
+
+    def stats(self):
+        entries = self._entries()
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'files': len(entries),
+                'bytes': sum(entry[1] for entry in entries),
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': self.hits / total if total else 0.0
+            }
+
+
+# Boyut sınırlı LRU cache (isabet istatistikleriyle)
+class LRUCache:
+    def __init__(self, max_size=1024):
+        self.max_size = max_size
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            value = self._items.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._items),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / total if total else 0.0
+            }
+
+
+# Süre sınırlı (TTL) ve boyut sınırlı LRU cache
+class TTLCache:
+    def __init__(self, max_size=1024, ttl=300):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = item
+            if expires_at <= time.monotonic():
+                del self._items[key]
+                self.misses += 1
+                return None
+
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._items[key] = (value, time.monotonic() + (self.ttl if ttl is None else ttl))
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._items.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
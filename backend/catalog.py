@@ -0,0 +1,75 @@
+import gzip
+import hashlib
+import json
+from types import MappingProxyType
+from sizing import CompiledCatalog
+
+try:
+    import brotli  # weasyprint (fonttools[woff]) ile birlikte kurulur; yoksa yalnızca gzip
+except ImportError:
+    brotli = None
+
+
+def _freeze(catalog):
+    return MappingProxyType({item_id: MappingProxyType(dict(info)) for item_id, info in catalog.items()})
+
+
+def _apply(catalog, overrides):
+    return {item_id: dict(info, **overrides.get(item_id, {})) for item_id, info in catalog.items()}
+
+
+def _thaw(catalog):
+    return {item_id: dict(info) for item_id, info in catalog.items()}
+
+
+# JSON gövdesinin bir kez serileştirilmiş ve sıkıştırılmış gösterimleri
+# Her gösterimin kendi güçlü ETag'i vardır (gövde özeti + encoding)
+class EncodedJSON:
+    def __init__(self, document):
+        body = json.dumps(document, ensure_ascii=False, sort_keys=True, separators=(',', ':')).encode('utf-8')
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        self.representations = {None: (body, digest), 'gzip': (gzip.compress(body, compresslevel=9, mtime=0), f'{digest}-gzip')}
+        if brotli is not None:
+            self.representations['br'] = (brotli.compress(body, quality=11), f'{digest}-br')
+
+    # İstemcinin kabul ettiği en küçük gösterim: (encoding, gövde, etag)
+    def negotiate(self, accept_encodings):
+        encoding = min(
+            (name for name in self.representations if name is None or accept_encodings[name]),
+            key=lambda name: len(self.representations[name][0])
+        )
+        return (encoding, ) + self.representations[encoding]
+
+
+# Modül/servis kataloğunun değişmez, sürümlü görüntüsü
+# Admin güncellemesinde yeni bir görüntü oluşturulup tek atama ile değiştirilir (copy-on-write);
+# okuyucular istek başında aldıkları görüntüyü kilitsiz ve tutarlı şekilde kullanır
+class CatalogSnapshot:
+    def __init__(self, modules, services, version=1, databases=None):
+        self.version = version
+        self.modules = _freeze(modules)
+        self.services = _freeze(services)
+        self.databases = _freeze(databases or {})
+        self.sizing = CompiledCatalog(self.modules, self.services, version=version)
+        self._encoded = None
+
+    # Varsayılan katalog + kalıcı değişiklikler ({kind: {item_id: {field: value}}})
+    @classmethod
+    def build(cls, modules, services, overrides, version, databases=None):
+        return cls(
+            _apply(modules, overrides.get('module', {})),
+            _apply(services, overrides.get('service', {})),
+            version,
+            databases
+        )
+
+    # /api/catalog gövdesi; görüntü değişmez olduğundan sürüm başına bir kez üretilir
+    def encoded(self):
+        if self._encoded is None:
+            self._encoded = EncodedJSON({
+                'version': self.version,
+                'modules': _thaw(self.modules),
+                'services': _thaw(self.services),
+                'databases': _thaw(self.databases)
+            })
+        return self._encoded
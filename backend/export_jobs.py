@@ -0,0 +1,93 @@
+import logging
+import multiprocessing
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+# Kuyruk dolu olduğunda fırlatılır (istemciye 429 döndürülür)
+class ExportQueueFull(Exception):
+    pass
+
+
+# Arka planda process pool ile çalışan export işleri
+# Tamamlanan çıktılar render cache'e yazılır, indirme oradan yapılır
+# İş kayıtları paylaşılan depoda tutulur; durum hangi worker'dan sorulursa sorulsun görülür
+class ExportJobQueue:
+    def __init__(self, cache, store, max_workers=2, max_pending=32, job_ttl=24 * 3600):
+        self.cache = cache
+        self.store = store
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.job_ttl = job_ttl
+        self._executor = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    # Pool ilk iş geldiğinde oluşturulur (pre-fork sırasında process açılmasın)
+    # Worker çok thread'li olduğundan fork kullanılmaz: çocuk süreç başka bir thread'in
+    # tuttuğu kilidi devralıp kilitlenebilir. Süreçler forkserver'dan başlatılır.
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context('forkserver')
+                )
+            return self._executor
+
+    def submit(self, req_id, fmt, key, func, *args):
+        now = time.time()
+        job = {
+            'id': str(uuid.uuid4()),
+            'requirement_id': req_id,
+            'format': fmt,
+            'cache_key': key,
+            'status': 'queued',
+            'error': None,
+            'created_at': now
+        }
+
+        # Çıktı zaten hazırsa render etmeye gerek yok
+        if self.cache.path(key) is not None:
+            job['status'] = 'done'
+            self.store.add(job)
+            return job
+
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise ExportQueueFull()
+            self._pending += 1
+
+        try:
+            self.store.prune(now - self.job_ttl)
+            self.store.add(job)
+            future = self._get_executor().submit(func, *args)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+
+        future.add_done_callback(lambda f: self._finish(job, f))
+        return job
+
+    def _finish(self, job, future):
+        try:
+            self.cache.put(job['cache_key'], future.result())
+            self.store.update(job['id'], 'done')
+        except Exception as e:
+            logger.error(f"Export job {job['id']} failed: {e}")
+            self.store.update(job['id'], 'failed', str(e))
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def get(self, job_id):
+        return self.store.get(job_id)
+
+    def pending(self):
+        with self._lock:
+            return self._pending
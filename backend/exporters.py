@@ -0,0 +1,446 @@
+import copy
+import importlib
+import io
+import logging
+import mimetypes
+import os
+import threading
+import time
+import zipfile
+from contextlib import contextmanager
+from datetime import datetime
+from metrics import stage
+
+logger = logging.getLogger(__name__)
+
+# PDF/DOCX üretimi
+# Bu modül process pool worker'larında da import edildiği için Flask'a bağımlı değildir
+
+# weasyprint (cairo/pango/fontconfig) ve python-docx ilk export isteğinde yüklenir;
+# chatbot ve generate istekleri bu maliyeti ödemez
+EXPORT_LIBRARIES = ('docx', 'weasyprint')
+IMPORT_TIMINGS = {}  # kütüphane -> yükleme süresi (saniye)
+_libraries = {}
+_import_lock = threading.Lock()
+
+
+def load_library(name):
+    module = _libraries.get(name)
+    if module is None:
+        with _import_lock:
+            module = _libraries.get(name)
+            if module is None:
+                start = time.perf_counter()
+                module = importlib.import_module(name)
+                IMPORT_TIMINGS[name] = time.perf_counter() - start
+                logger.info(f"Loaded export library {name} in {IMPORT_TIMINGS[name] * 1000:.0f} ms")
+                _libraries[name] = module
+    return module
+
+
+# Pre-fork senaryosunda export kütüphanelerini master process'te önceden yükle
+def warm_up():
+    for name in EXPORT_LIBRARIES:
+        load_library(name)
+    for pool in (PDF_RENDERERS, DOCX_SKELETONS):
+        with pool.checkout():
+            pass
+
+
+# Süreç başına yeniden kullanılan render nesneleri (WeasyPrint bağlamı, Word iskeleti)
+# Nesne kullanım süresince tek bir render'a aittir, bitince havuza geri döner. Thread'e bağlı
+# olmadığından gevent ve thread'li geliştirme sunucusunda da her istekte yeniden oluşturulmaz.
+# Fork sonrası üst sürecin nesneleri kullanılmaz; hata veren nesne havuza geri konmaz
+class ObjectPool:
+    def __init__(self, factory, max_idle=4):
+        self.factory = factory
+        self.max_idle = max_idle
+        self.created = 0
+        self._idle = []
+        self._pid = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def checkout(self):
+        with self._lock:
+            if self._pid != os.getpid():
+                self._idle = []
+                self._pid = os.getpid()
+            item = self._idle.pop() if self._idle else None
+        if item is None:
+            item = self.factory()
+            with self._lock:
+                self.created += 1
+        yield item
+        with self._lock:
+            if self._pid == os.getpid() and len(self._idle) < self.max_idle:
+                self._idle.append(item)
+
+    def stats(self):
+        with self._lock:
+            return {'created': self.created, 'idle': len(self._idle)}
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# PDF şablonunun harici stil dosyaları (renderer oluşturulurken bir kez parse edilir)
+PDF_STYLESHEETS = [os.path.join(BASE_DIR, 'templates', 'requirement_template.css')]
+
+# Şablonda kullanılan logo, font vb. dosyalar bellekten servis edilir
+PDF_ASSET_DIR = os.environ.get('PDF_ASSET_DIR', os.path.join(BASE_DIR, 'static'))
+PDF_ASSET_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.svg', '.gif', '.css', '.ttf', '.otf', '.woff', '.woff2')
+PDF_ASSET_MAX_BYTES = 16 * 1024 * 1024
+
+
+def _load_assets(directory):
+    assets = {}
+    total = 0
+    for root, _, files in os.walk(directory):
+        for name in sorted(files):
+            if not name.lower().endswith(PDF_ASSET_EXTENSIONS):
+                continue
+            path = os.path.join(root, name)
+            with open(path, 'rb') as f:
+                data = f.read()
+            total += len(data)
+            if total > PDF_ASSET_MAX_BYTES:
+                logger.warning(f"PDF asset limit reached, {path} will be fetched from disk")
+                return assets
+            asset = {'string': data, 'mime_type': mimetypes.guess_type(name)[0]}
+            relative = os.path.relpath(path, directory).replace(os.sep, '/')
+            # Hem göreli (img/Cbot.png) hem /static/ ile başlayan adresler eşleşir
+            assets['file://' + os.path.abspath(path)] = asset
+            assets['file:///static/' + relative] = asset
+    return assets
+
+
+# Worker boyunca yaşayan WeasyPrint render bağlamı
+# Font yapılandırması, parse edilmiş stil dosyaları ve asset'ler her PDF'te yeniden kullanılır
+class PdfRenderer:
+    def __init__(self, stylesheets=PDF_STYLESHEETS, asset_dir=PDF_ASSET_DIR):
+        weasyprint = load_library('weasyprint')
+        fonts = load_library('weasyprint.text.fonts')
+        self._html = weasyprint.HTML
+        self._default_url_fetcher = weasyprint.default_url_fetcher
+        self.font_config = fonts.FontConfiguration()
+        self.assets = _load_assets(asset_dir) if os.path.isdir(asset_dir) else {}
+        self.base_url = os.path.abspath(asset_dir) + os.sep
+        self.stylesheets = [
+            weasyprint.CSS(filename=path, font_config=self.font_config, url_fetcher=self.url_fetcher)
+            for path in stylesheets if os.path.exists(path)
+        ]
+
+    def url_fetcher(self, url, *args, **kwargs):
+        asset = self.assets.get(url)
+        if asset is not None:
+            return dict(asset, redirected_url=url)
+        return self._default_url_fetcher(url, *args, **kwargs)
+
+    # target verilirse PDF doğrudan dosyaya yazılır, verilmezse bayt olarak döndürülür
+    def render(self, html_content, target=None):
+        pdf_file = io.BytesIO() if target is None else target
+        with stage('write_pdf'):
+            self._html(
+                string=html_content,
+                base_url=self.base_url,
+                url_fetcher=self.url_fetcher
+            ).write_pdf(pdf_file, stylesheets=self.stylesheets, font_config=self.font_config)
+        if target is None:
+            return pdf_file.getvalue()
+
+
+# FontConfiguration aynı anda iki render'da kullanılmaz; eşzamanlı her render havuzdan ayrı bir renderer alır
+PDF_RENDERERS = ObjectPool(PdfRenderer)
+
+# HTML içeriğinden PDF üret
+def render_pdf(html_content, target=None):
+    with PDF_RENDERERS.checkout() as renderer:
+        return renderer.render(html_content, target)
+
+# Seek edilemeyen çıktıya yazılan ZIP arşivi
+# Her dosya eklendiğinde o ana kadar üretilen baytlar alınıp istemciye gönderilir;
+# arşivin tamamı bellekte tutulmaz
+class ZipStream:
+    def __init__(self, compression=zipfile.ZIP_DEFLATED):
+        self._chunks = []
+        self._zip = zipfile.ZipFile(self, 'w', compression=compression)
+
+    # zipfile tarafından çağrılır
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def _drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+    # Dosyayı arşive ekle ve üretilen baytları döndür
+    def add(self, name, data):
+        self._zip.writestr(name, data)
+        return self._drain()
+
+    # Dosyayı diskten parça parça okuyarak arşive ekle
+    def add_file(self, name, path):
+        self._zip.write(path, name)
+        return self._drain()
+
+    # Merkezi dizini yaz ve kalan baytları döndür
+    def close(self):
+        self._zip.close()
+        return self._drain()
+
+# Word belgesinin sabit bölümleri
+# Her parça bir kez python-docx ile oluşturulur, sonra XML'i kopyalanarak kullanılır
+def _title_fragment(doc):
+    doc.add_heading('CBOT Kurulum Gereksinimleri', 0)
+
+def _hardware_fragment(doc):
+    doc.add_heading('3. Donanım Gereksinimleri', level=1)
+    
+    hardware_table = doc.add_table(rows=1, cols=6)
+    hardware_table.style = 'Table Grid'
+    
+    # Tablo başlıkları
+    header_cells = hardware_table.rows[0].cells
+    header_cells[0].text = 'Ortam'
+    header_cells[1].text = 'CPU'
+    header_cells[2].text = 'RAM'
+    header_cells[3].text = 'Disk'
+    header_cells[4].text = 'GPU'
+    header_cells[5].text = 'OS'
+
+def _dns_fragment(doc):
+    doc.add_paragraph('Load Balancer 5000 portunda WebSocket desteği sağlamalıdır', style='List Bullet')
+    
+    doc.add_heading('DNS Kayıtları:', level=2)
+    dns_table = doc.add_table(rows=1, cols=3)
+    dns_table.style = 'Table Grid'
+    
+    # DNS tablosu başlıkları
+    dns_header = dns_table.rows[0].cells
+    dns_header[0].text = 'Servis'
+    dns_header[1].text = 'DNS Kaydı'
+    dns_header[2].text = 'Port'
+
+def _docker_fragment(doc):
+    doc.add_heading('6. Docker Image ve Registry', level=1)
+    doc.add_paragraph('Tüm servis image\'ları registry.cbot.ai adresinden çekilir', style='List Bullet')
+    doc.add_paragraph('Sunucular 443 portundan bu adrese erişebilmelidir', style='List Bullet')
+    
+    doc.add_heading('Gerekli Containerlar:', level=2)
+
+def _ldap_notes_fragment(doc):
+    doc.add_paragraph('Email, Role, Name field\'ları mapping yapılmalıdır.')
+    doc.add_paragraph('Rollerin panelde LDAP ile birebir eşleşmesi gerekmektedir.')
+
+def _footer_fragment(doc):
+    doc.add_paragraph('Kurulum topolojisi görsel temsili AI asistan tarafından oluşturulmuştur.')
+    
+    # Doküman sonunda yasal uyarı
+    doc.add_paragraph()
+    doc.add_paragraph('Bu doküman CBOT tarafından otomatik olarak oluşturulmuştur. Detaylı bilgi için teknik ekibimizle iletişime geçebilirsiniz.')
+
+DOCX_FRAGMENTS = {
+    'title': _title_fragment,
+    'environment': lambda doc: doc.add_heading('1. Ortam Bilgileri', level=1),
+    'modules': lambda doc: doc.add_heading('2. Seçilen Modüller', level=1),
+    'services': lambda doc: doc.add_heading('Yardımcı Servisler:', level=2),
+    'hardware': _hardware_fragment,
+    'database': lambda doc: doc.add_heading('4. Veritabanı Gereksinimleri', level=1),
+    'database_user': lambda doc: _bold_label_paragraph(doc, 'Kullanıcı: ', 'OWNER yetkili kullanıcı'),
+    'database_notice': lambda doc: doc.add_paragraph('IP ve port paylaşımı zorunludur'),
+    'network': lambda doc: (
+        doc.add_heading('5. Network / Firewall Gereksinimleri', level=1),
+        doc.add_paragraph('Sunucular internet erişimli olmalıdır', style='List Bullet')
+    ),
+    'dns': _dns_fragment,
+    'docker': _docker_fragment,
+    'ldap_notes': _ldap_notes_fragment,
+    'footer': _footer_fragment
+}
+
+
+def _bold_label_paragraph(doc, label, value):
+    p = doc.add_paragraph()
+    p.add_run(label).bold = True
+    p.add_run(value)
+    return p
+
+
+# Süreç başına havuzda tutulan Word iskeleti
+# Varsayılan şablon her istekte yeniden açılmaz; aynı Document nesnesinin gövdesi
+# sıfırlanıp sabit parçaların kopyalarıyla doldurulur
+class DocxSkeleton:
+    def __init__(self):
+        self.document = load_library('docx').Document()
+        self._table = load_library('docx.table').Table
+        self.fragments = {name: self._capture(build) for name, build in DOCX_FRAGMENTS.items()}
+
+    # Parçayı iskelet üzerinde oluştur ve gövdeden ayırarak sakla
+    def _capture(self, build):
+        body = self.document.element.body
+        before = len(body)
+        build(self.document)
+        # Yeni elemanlar sectPr'den önce eklenir
+        elements = list(body)[before - 1:-1]
+        for element in elements:
+            body.remove(element)
+        return elements
+
+    # Parçanın kopyasını belgenin sonuna ekle, eklenen son elemanı döndür
+    def append(self, doc, name):
+        body = doc.element.body
+        element = None
+        for fragment_element in self.fragments[name]:
+            element = copy.deepcopy(fragment_element)
+            body.insert_element_before(element, 'w:sectPr')
+        return element
+
+    # Parçadaki tabloyu satır eklenebilir halde döndür
+    def append_table(self, doc, name):
+        return self._table(self.append(doc, name), doc._body)
+
+    # Yeniden kullanılan belgeyi yalnızca başlık içerecek şekilde sıfırla
+    def new_document(self):
+        body = self.document.element.body
+        for element in list(body)[:-1]:
+            body.remove(element)
+        self.append(self.document, 'title')
+        return self.document
+
+
+DOCX_SKELETONS = ObjectPool(DocxSkeleton)
+
+# Gereksinim dokümanından Word belgesi üret
+# target verilirse belge doğrudan dosyaya yazılır, verilmezse bayt olarak döndürülür
+# Belge iskeletin kendisidir; iskelet havuza dönmeden önce kaydedilir
+def render_docx(requirement, target=None):
+    docx_file = io.BytesIO() if target is None else target
+    with DOCX_SKELETONS.checkout() as skeleton:
+        with stage('docx_build'):
+            doc = skeleton.new_document()
+            
+            # Belge içeriğini doldur
+            add_requirement_content_to_docx(doc, requirement, skeleton)
+        
+        with stage('docx_save'):
+            doc.save(docx_file)
+    if target is None:
+        return docx_file.getvalue()
+
+# Word belgesi içeriğini oluşturma
+# Sabit bölümler iskeletten kopyalanır, yalnızca dinamik kısımlar burada oluşturulur
+def add_requirement_content_to_docx(doc, requirement, skeleton):
+    # Belge başlığı ve tarihi
+    doc.add_paragraph(f"Oluşturulma Tarihi: {datetime.fromisoformat(requirement['created_at']).strftime('%d.%m.%Y %H:%M')}")
+    skeleton.append(doc, 'environment')
+    
+    # Ortam bilgileri
+    environment_text = ''
+    if requirement['environment'] == 'both':
+        environment_text = 'Test ve Canlı'
+    elif requirement['environment'] == 'test':
+        environment_text = 'Test'
+    else:
+        environment_text = 'Canlı'
+    
+    environment_type_text = 'On-Premise' if requirement['environment_type'] == 'on-prem' else 'Bulut'
+    
+    _bold_label_paragraph(doc, 'Ortam Tipi: ', environment_text)
+    _bold_label_paragraph(doc, 'Kurulum Ortamı: ', environment_type_text)
+    
+    # Seçilen modüller
+    skeleton.append(doc, 'modules')
+    for module in requirement['core_modules']:
+        doc.add_paragraph(module['name'], style='List Bullet')
+    
+    # Yardımcı servisler
+    if requirement['auxiliary_services']:
+        skeleton.append(doc, 'services')
+        for service in requirement['auxiliary_services']:
+            doc.add_paragraph(service['name'], style='List Bullet')
+    
+    # Donanım gereksinimleri
+    hardware_table = skeleton.append_table(doc, 'hardware')
+    
+    # Tablo içeriği
+    hw_requirements = requirement['hardware_requirements']
+    
+    for env_key, env_name in (('test', 'Test'), ('live', 'Canlı')):
+        if env_key in hw_requirements:
+            env_requirements = hw_requirements[env_key]
+            row_cells = hardware_table.add_row().cells
+            row_cells[0].text = env_name
+            row_cells[1].text = f"{env_requirements['cpu']} Core"
+            row_cells[2].text = f"{env_requirements['ram']} GB"
+            row_cells[3].text = f"{env_requirements['disk']} GB"
+            row_cells[4].text = "Gerekmiyor" if not env_requirements['gpu'] else f"{env_requirements['gpu_ram']} GB VRAM"
+            row_cells[5].text = "CentOS 7/8 veya RHEL"
+    
+    # Veritabanı gereksinimleri
+    skeleton.append(doc, 'database')
+    _bold_label_paragraph(doc, 'Veritabanı Tipi: ', requirement['database_requirements']['type'])
+    skeleton.append(doc, 'database_user')
+    
+    if requirement['database_requirements']['collation']:
+        _bold_label_paragraph(doc, 'Collation: ', requirement['database_requirements']['collation'])
+    
+    _bold_label_paragraph(doc, 'Port: ', str(requirement['database_requirements']['port']))
+    skeleton.append(doc, 'database_notice')
+    
+    # Network/Firewall gereksinimleri
+    skeleton.append(doc, 'network')
+    doc.add_paragraph(f"Veritabanı portları açık olmalıdır ({requirement['database_requirements']['port']})", style='List Bullet')
+    dns_table = skeleton.append_table(doc, 'dns')
+    
+    # DNS tablosu içeriği
+    for record in requirement['network_requirements']['dns_records']:
+        row_cells = dns_table.add_row().cells
+        row_cells[0].text = record['service'].split('-')[1].capitalize() + (' (Test)' if record['service'].endswith('-test') else '')
+        row_cells[1].text = record['service']
+        row_cells[2].text = f"{record['port']}{' (WebSocket)' if record.get('websocket', False) else ''}"
+    
+    # Docker Image ve Registry
+    skeleton.append(doc, 'docker')
+    for container in requirement['docker_requirements']['containers']:
+        doc.add_paragraph(container, style='List Bullet')
+    
+    # LDAP Gereksinimleri (varsa)
+    section_count = 7
+    if 'ldap_requirements' in requirement:
+        doc.add_heading(f'{section_count}. LDAP Gereksinimleri', level=1)
+        
+        _bold_label_paragraph(doc, 'LDAP URL: ', requirement['ldap_requirements']['url'] or 'Belirtilmedi')
+        _bold_label_paragraph(doc, 'BIND DN: ', requirement['ldap_requirements']['bind_dn'] or 'Belirtilmedi')
+        _bold_label_paragraph(doc, 'SEARCH BASE: ', requirement['ldap_requirements']['search_base'] or 'Belirtilmedi')
+        _bold_label_paragraph(doc, 'SEARCH FILTER: ', requirement['ldap_requirements']['search_filter'] or 'Belirtilmedi')
+        
+        skeleton.append(doc, 'ldap_notes')
+        
+        section_count += 1
+    
+    # AI Servisleri Ek Gereksinimleri (varsa)
+    if 'ai_requirements' in requirement:
+        doc.add_heading(f'{section_count}. AI Servisleri Ek Gereksinimleri', level=1)
+        
+        for ai_req in requirement['ai_requirements']:
+            doc.add_heading(f"{ai_req['service']} Gereksinimleri:", level=2)
+            
+            if ai_req['service'] == 'AI Flow':
+                doc.add_paragraph(f"Minimum {ai_req['cpu_min']} Core CPU, {ai_req['ram_min']} GB RAM", style='List Bullet')
+                if ai_req.get('postgresql_disk', 0) > 0:
+                    doc.add_paragraph(f"{ai_req['postgresql_disk']} GB disk alanı (PostgreSQL)", style='List Bullet')
+            
+            if ai_req['service'] == 'HF Model Hosting':
+                doc.add_paragraph('GPU destekli sunucu', style='List Bullet')
+                doc.add_paragraph(f"Minimum {ai_req['gpu_ram']} GB VRAM", style='List Bullet')
+                doc.add_paragraph(f"Minimum {ai_req['ram_min']} GB sistem RAM", style='List Bullet')
+        
+        section_count += 1
+    
+    # Kurulum Topolojisi
+    doc.add_heading(f'{section_count}. Kurulum Topolojisi', level=1)
+    skeleton.append(doc, 'footer')
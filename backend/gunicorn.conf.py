@@ -0,0 +1,58 @@
+import multiprocessing
+import os
+
+# Production sunucu yapılandırması (gunicorn -c gunicorn.conf.py wsgi:app)
+
+DEBUG = os.environ.get('DEBUG', 'False').lower() == 'true'
+GEVENT_ENABLED = os.environ.get('GEVENT', 'False').lower() == 'true'
+
+# gevent worker'larında monkey patch uygulama import edilmeden önce yapılmalı
+if GEVENT_ENABLED:
+    from gevent import monkey
+    monkey.patch_all()
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+
+# Worker sayısı çekirdek sayısından türetilir, WEB_CONCURRENCY ile ezilebilir
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+# Uygulama süreç başına kaynakları (export process pool) worker sayısına göre boyutlandırır
+os.environ['WEB_CONCURRENCY'] = str(workers)
+
+# gevent: chatbot istekleri gibi I/O bekleyen çağrılar için yüzlerce eşzamanlı bağlantı
+# gthread: varsayılan, her worker'da sabit sayıda thread
+worker_class = 'gevent' if GEVENT_ENABLED else 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 500))
+
+# Uygulama ve ağır kütüphaneler (weasyprint, docx) fork öncesi master'da yüklenir,
+# worker'lar bu belleği copy-on-write olarak paylaşır.
+# Geliştirme modunda kod değişikliklerinde otomatik yeniden yükleme yapılır.
+preload_app = not DEBUG
+reload = DEBUG
+
+# Export kütüphaneleri normalde ilk PDF/DOCX isteğinde yüklenir; preload modunda
+# master'da önceden yüklenerek tüm worker'larla paylaşılır
+EXPORT_WARMUP = os.environ.get('EXPORT_WARMUP', str(preload_app)).lower() == 'true'
+
+
+def on_starting(server):
+    if EXPORT_WARMUP:
+        from exporters import warm_up
+        warm_up()
+
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = 5
+
+# Bellek sızıntılarına karşı worker'lar belirli istek sayısından sonra yenilenir
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.environ.get('LOG_LEVEL', 'info')
+
+# Graceful reload: `kill -HUP <master pid>` worker'ları sırayla yeniler.
+# preload_app açıkken yeni kod için master'ın da yeniden başlatılması gerekir
+# (`kill -USR2` ile yeni master başlatılıp eskisine `kill -TERM` gönderilir).
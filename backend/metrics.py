@@ -0,0 +1,299 @@
+import fcntl
+import glob
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Prometheus metin formatında metrikler (harici bağımlılık olmadan)
+# Her worker kendi metriklerini bellekte tutar ve belirli aralıklarla paylaşılan dizine yazar;
+# /metrics isteğine cevap veren worker tüm dosyaları birleştirir
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+# function verilirse değerler okuma anında {etiketler: değer} olarak hesaplanır
+# (başka bir nesnenin tuttuğu sayaçları yayınlamak için)
+class Metric:
+    type = None
+
+    def __init__(self, name, help_text, labels=(), function=None):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.function = function
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def describe(self):
+        return {'type': self.type, 'help': self.help, 'labels': list(self.labels)}
+
+    def samples(self):
+        if self.function is not None:
+            return [[list(labels), value] for labels, value in self.function().items()]
+        with self._lock:
+            return [[list(labels), value] for labels, value in self._values.items()]
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+
+class Gauge(Metric):
+    type = 'gauge'
+
+    def set(self, value, *label_values):
+        with self._lock:
+            self._values[label_values] = value
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def dec(self, *label_values, amount=1):
+        self.inc(*label_values, amount=-amount)
+
+    @contextmanager
+    def track(self, *label_values):
+        self.inc(*label_values)
+        try:
+            yield
+        finally:
+            self.dec(*label_values)
+
+
+# Değer: [kova sayıları (kümülatif değil, son kova +Inf), toplam, adet]
+class Histogram(Metric):
+    type = 'histogram'
+
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(buckets)
+
+    def describe(self):
+        return dict(super().describe(), buckets=list(self.buckets))
+
+    def observe(self, value, *label_values):
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            state = self._values.get(label_values)
+            if state is None:
+                state = self._values[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, *label_values):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *label_values)
+
+    def samples(self):
+        with self._lock:
+            return [[list(labels), [list(state[0]), state[1], state[2]]] for labels, state in self._values.items()]
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name, help_text, labels=(), function=None):
+        return self._register(Counter(name, help_text, labels, function))
+
+    def gauge(self, name, help_text, labels=(), function=None):
+        return self._register(Gauge(name, help_text, labels, function))
+
+    def histogram(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, help_text, labels, buckets))
+
+    # {isim: {type, help, labels, [buckets], samples: [[etiketler, değer], ...]}}
+    def snapshot(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {metric.name: dict(metric.describe(), samples=metric.samples()) for metric in metrics}
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    'cbot_stage_duration_seconds',
+    'Duration of instrumented stages inside request handlers',
+    ('stage',)
+)
+
+
+# Kod bloğunun süresini aşama histogramına yaz
+def stage(name):
+    return STAGE_SECONDS.time(name)
+
+
+def _add(a, b):
+    if isinstance(a, list):
+        return [list(map(sum, zip(a[0], b[0]))), a[1] + b[1], a[2] + b[2]]
+    return a + b
+
+
+# Snapshot'ları birleştir; aynı etiketli değerler toplanır
+# include_gauges=False ise gauge'lar atlanır (kapanmış worker'ların anlık değerleri geçersizdir)
+def merge(snapshots, include_gauges=True):
+    merged = {}
+    for snapshot in snapshots:
+        for name, metric in snapshot.items():
+            if metric['type'] == 'gauge' and not include_gauges:
+                continue
+            target = merged.setdefault(name, dict(metric, samples=[]))
+            values = {tuple(labels): value for labels, value in target['samples']}
+            for labels, value in metric['samples']:
+                key = tuple(labels)
+                values[key] = _add(values[key], value) if key in values else value
+            target['samples'] = [[list(labels), value] for labels, value in values.items()]
+    return merged
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in list(zip(names, values)) + list(extra)]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+# Prometheus metin formatı (text/plain; version=0.0.4)
+def render(snapshot):
+    lines = []
+    for name in sorted(snapshot):
+        metric = snapshot[name]
+        lines.append(f"# HELP {name} {metric['help']}")
+        lines.append(f"# TYPE {name} {metric['type']}")
+        for labels, value in sorted(metric['samples']):
+            if metric['type'] == 'histogram':
+                counts, total, count = value
+                cumulative = 0
+                for bound, bucket_count in zip(list(metric['buckets']) + [float('inf')], counts):
+                    cumulative += bucket_count
+                    lines.append(f"{name}_bucket{_labels(metric['labels'], labels, [('le', _number(bound))])} {cumulative}")
+                lines.append(f"{name}_sum{_labels(metric['labels'], labels)} {_number(total)}")
+                lines.append(f"{name}_count{_labels(metric['labels'], labels)} {count}")
+            else:
+                lines.append(f"{name}{_labels(metric['labels'], labels)} {_number(value)}")
+    return '\n'.join(lines) + '\n'
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+# Worker'lar arası metrik paylaşımı
+# Her process metriklerini <dizin>/worker-<pid>.json dosyasına yazar. Kapanmış worker'ların
+# sayaçları archive.json içinde birleştirilir ki yeniden başlatmalarda değerler geriye gitmesin.
+class SharedMetrics:
+    def __init__(self, registry, directory, flush_interval=2.0):
+        self.registry = registry
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._flusher_pid = None
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _worker_path(self, pid):
+        return os.path.join(self.directory, f'worker-{pid}.json')
+
+    def _write(self, path, snapshot):
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _read(path):
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def flush(self):
+        self._write(self._worker_path(os.getpid()), self.registry.snapshot())
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+
+    # Worker'ın ilk isteğinde arka planda flush_interval saniyede bir yazan thread başlatılır
+    # (fork öncesi master'da thread açılmaz)
+    def start(self):
+        if self._flusher_pid == os.getpid():
+            return
+        with self._lock:
+            if self._flusher_pid != os.getpid():
+                threading.Thread(target=self._run, name='metrics-flusher', daemon=True).start()
+                self._flusher_pid = os.getpid()
+
+    # Kapanmış worker dosyalarını arşive taşı
+    def _compact(self, dead_paths):
+        with open(os.path.join(self.directory, 'archive.lock'), 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            archive_path = os.path.join(self.directory, 'archive.json')
+            snapshots = [self._read(archive_path) or {}]
+            existing = [path for path in dead_paths if os.path.exists(path)]
+            snapshots += [self._read(path) or {} for path in existing]
+            self._write(archive_path, merge(snapshots, include_gauges=False))
+            for path in existing:
+                os.unlink(path)
+
+    # Tüm worker'ların metriklerini birleştir
+    def collect(self):
+        own = self.registry.snapshot()
+        self._write(self._worker_path(os.getpid()), own)
+        self.start()
+
+        snapshots = [own]
+        dead_paths = []
+        for path in glob.glob(os.path.join(self.directory, 'worker-*.json')):
+            pid = int(os.path.basename(path)[len('worker-'):-len('.json')])
+            if pid == os.getpid():
+                continue
+            if not _pid_alive(pid):
+                dead_paths.append(path)
+                continue
+            snapshot = self._read(path)
+            if snapshot:
+                snapshots.append(snapshot)
+
+        if dead_paths:
+            self._compact(dead_paths)
+        archive = self._read(os.path.join(self.directory, 'archive.json'))
+        if archive:
+            snapshots.append(archive)
+        return merge(snapshots)
@@ -0,0 +1,198 @@
+import time
+
+# Modül/servislerin sunuculara yerleşim planı (çok boyutlu bin packing)
+# Test ve canlı bileşenleri aynı sunucuya yerleştirilmez (anti-affinity); her ortam ayrı çözülür.
+# Önce first-fit-decreasing ile bir çözüm bulunur, sonra branch-and-bound ile iyileştirilir.
+# Hedef toplam maliyetin, eşitlikte sunucu sayısının en küçük olmasıdır.
+# Arama max_expansions düğümle sınırlıdır; sınıra ulaşılırsa bulunan en iyi çözüm döner (optimal: False).
+
+DIMENSIONS = ('cpu', 'ram', 'disk', 'gpu_ram')
+
+
+# Bileşen hiçbir sunucu tipine sığmıyorsa fırlatılır
+class PlacementError(Exception):
+    def __init__(self, components):
+        super().__init__(', '.join(components))
+        self.components = components
+
+
+# Seçilen bileşenlerin ortam bazında kaynak ihtiyaçları: {ortam: [(bileşen, (cpu, ram, disk, gpu_ram))]}
+def component_demands(modules, services, environment, module_ids, service_ids):
+    environments = ('test', 'live') if environment == 'both' else (environment,)
+    demands = {}
+    for env in environments:
+        items = []
+        for catalog, ids in ((modules, module_ids), (services, service_ids)):
+            for item_id in ids:
+                info = catalog[item_id]
+                gpu_ram = int(info.get('gpu_ram', 0)) if info.get('requires_gpu', False) else 0
+                items.append((item_id, (int(info[f'cpu_{env}']), int(info[f'ram_{env}']), int(info[f'disk_{env}']), gpu_ram)))
+        demands[env] = items
+    return demands
+
+
+def _fits(free, demand):
+    return all(f >= d for f, d in zip(free, demand))
+
+
+def _subtract(free, demand):
+    return tuple(f - d for f, d in zip(free, demand))
+
+
+# shapes: [{'name', 'capacity': (cpu, ram, disk, gpu_ram), 'cost', 'count' (None = sınırsız)}]
+# Dönüş: ([(shape index, [bileşenler], boş kapasite)], maliyet, optimal mi)
+def pack(items, shapes, max_expansions=10000):
+    unplaceable = [item_id for item_id, demand in items if not any(_fits(s['capacity'], demand) for s in shapes)]
+    if unplaceable:
+        raise PlacementError(unplaceable)
+    if not items:
+        return [], 0, True
+
+    # Büyük (en kısıtlayıcı boyutu en büyük) bileşenler önce
+    max_capacity = [max(s['capacity'][d] for s in shapes) for d in range(len(DIMENSIONS))]
+    order = sorted(
+        items,
+        key=lambda item: max(v / c for v, c in zip(item[1], max_capacity) if c),
+        reverse=True
+    )
+    shape_order = sorted(range(len(shapes)), key=lambda i: shapes[i]['cost'])
+
+    # Kalan bileşenlerin toplam ihtiyacı (alt sınır hesabı için)
+    suffix = [(0,) * len(DIMENSIONS)] * (len(order) + 1)
+    for i in range(len(order) - 1, -1, -1):
+        suffix[i] = tuple(a + b for a, b in zip(suffix[i + 1], order[i][1]))
+    # cover[d][x]: boyut d'de en az x kapasite sağlayan en ucuz sunucu kombinasyonunun maliyeti
+    # (sayı sınırı yok sayılır; kapasitelerin tam sayı katlı olmasını da hesaba katan alt sınır)
+    cover = []
+    for d in range(len(DIMENSIONS)):
+        costs = [0.0] + [float('inf')] * suffix[0][d]
+        for x in range(1, suffix[0][d] + 1):
+            for s in shapes:
+                if s['capacity'][d]:
+                    costs[x] = min(costs[x], s['cost'] + costs[max(0, x - s['capacity'][d])])
+        cover.append(costs)
+
+    # Maliyete ve sunucu sayısına alt sınır (free: açık sunuculardaki toplam boş kapasite)
+    def lower_bound(i, free):
+        bound, nodes = 0, 0
+        for d in range(len(DIMENSIONS)):
+            leftover = suffix[i][d] - free[d]
+            if leftover > 0:
+                bound = max(bound, cover[d][leftover])
+                nodes = max(nodes, -(-leftover // max_capacity[d]))
+        return bound, nodes
+
+    def can_open(shape_index, used):
+        count = shapes[shape_index]['count']
+        return count is None or used[shape_index] < count
+
+    # First-fit-decreasing: ilk sığan sunucu, yoksa sequence sırasıyla sığan ilk yeni sunucu
+    # Sonra her sunucu, yükünü taşıyan en ucuz tipe küçültülür
+    def first_fit(sequence):
+        bins = []
+        used = [0] * len(shapes)
+        for item_id, demand in order:
+            for b in bins:
+                if _fits(b[1], demand):
+                    b[1] = _subtract(b[1], demand)
+                    b[2].append(item_id)
+                    break
+            else:
+                for s in sequence:
+                    if can_open(s, used) and _fits(shapes[s]['capacity'], demand):
+                        bins.append([s, _subtract(shapes[s]['capacity'], demand), [item_id]])
+                        used[s] += 1
+                        break
+                else:
+                    return None, item_id
+        for b in bins:
+            load = _subtract(shapes[b[0]]['capacity'], b[1])
+            used[b[0]] -= 1
+            b[0] = next(s for s in shape_order if can_open(s, used) and _fits(shapes[s]['capacity'], load))
+            used[b[0]] += 1
+            b[1] = _subtract(shapes[b[0]]['capacity'], load)
+        return bins, None
+
+    # Önce ucuz tiplerle, sonra büyük tiplerle dene; iyi bir başlangıç çözümü aramayı hızlandırır
+    largest_first = sorted(range(len(shapes)), key=lambda i: -sum(c / m for c, m in zip(shapes[i]['capacity'], max_capacity) if m))
+    best = {'cost': float('inf'), 'bins': []}
+    unplaced = None
+    for sequence in (shape_order, largest_first):
+        bins, unplaced_item = first_fit(sequence)
+        if bins is None:
+            unplaced = unplaced_item
+            continue
+        cost = sum(shapes[b[0]]['cost'] for b in bins)
+        if (cost, len(bins)) < (best['cost'], len(best['bins'])):
+            best = {'cost': cost, 'bins': [(s, list(members), free) for s, free, members in bins]}
+    state = {'expansions': 0, 'truncated': False}
+
+    def search(i, bins, used, cost, total_free):
+        if state['expansions'] >= max_expansions:
+            state['truncated'] = True
+            return
+        state['expansions'] += 1
+
+        # Maliyet eşitse daha az sunuculu çözüm tercih edilir
+        bound, nodes = lower_bound(i, total_free)
+        bound += cost
+        if bound > best['cost'] + 1e-9 or (bound > best['cost'] - 1e-9 and len(bins) + nodes >= len(best['bins'])):
+            return
+        if i == len(order):
+            best['cost'] = cost
+            best['bins'] = [(s, list(members), free) for s, free, members in bins]
+            return
+
+        item_id, demand = order[i]
+        # Aynı tip ve aynı boş kapasitedeki sunucular eşdeğerdir, biri denenir
+        tried = set()
+        for b in bins:
+            key = (b[0], b[1])
+            if key in tried or not _fits(b[1], demand):
+                continue
+            tried.add(key)
+            free = b[1]
+            b[1] = _subtract(free, demand)
+            b[2].append(item_id)
+            search(i + 1, bins, used, cost, _subtract(total_free, demand))
+            b[2].pop()
+            b[1] = free
+
+        for s in shape_order:
+            if can_open(s, used) and _fits(shapes[s]['capacity'], demand):
+                bins.append([s, _subtract(shapes[s]['capacity'], demand), [item_id]])
+                used[s] += 1
+                opened = tuple(f + c - d for f, c, d in zip(total_free, shapes[s]['capacity'], demand))
+                search(i + 1, bins, used, cost + shapes[s]['cost'], opened)
+                used[s] -= 1
+                bins.pop()
+
+    search(0, [], [0] * len(shapes), 0, (0,) * len(DIMENSIONS))
+    if best['cost'] == float('inf'):
+        # Sunucu sayısı sınırları yüzünden yerleştirilemedi (hangi bileşende takıldığı bilinmiyorsa tümü)
+        raise PlacementError([unplaced] if unplaced is not None else [item_id for item_id, _ in order])
+    return best['bins'], best['cost'], not state['truncated']
+
+
+# Tüm ortamlar için yerleşim planı
+def plan(demands, shapes, max_expansions=10000):
+    started = time.perf_counter()
+    environments = {}
+    for env, items in demands.items():
+        bins, cost, optimal = pack(items, shapes, max_expansions)
+        nodes = []
+        for shape_index, members, free in bins:
+            shape = shapes[shape_index]
+            nodes.append({
+                'shape': shape['name'],
+                'capacity': dict(zip(DIMENSIONS, shape['capacity'])),
+                'used': dict(zip(DIMENSIONS, (c - f for c, f in zip(shape['capacity'], free)))),
+                'components': members
+            })
+        environments[env] = {'nodes': nodes, 'cost': cost, 'optimal': optimal}
+    return {
+        'environments': environments,
+        'node_count': sum(len(e['nodes']) for e in environments.values()),
+        'total_cost': sum(e['cost'] for e in environments.values()),
+        'solve_ms': (time.perf_counter() - started) * 1000
+    }
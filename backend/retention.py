@@ -0,0 +1,102 @@
+import fcntl
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+
+# Gereksinim dokümanları için saklama politikası
+# max_age_days'ten eski ve en yeni max_count dokümanın dışında kalanlar arka planda silinir,
+# render çıktıları cache'ten kaldırılır ve veritabanı dosyası küçültülür.
+# Thread her worker'da ilk istekte başlatılır; aynı anda yalnızca bir worker süpürür (dosya kilidi).
+class RetentionSweeper:
+    def __init__(self, store, cache, render_keys, max_age_days=0, max_count=0, interval=300,
+                 tombstone_days=90, batch_size=500):
+        self.store = store
+        self.cache = cache
+        self.render_keys = render_keys  # doküman id -> render cache anahtarları
+        self.max_age_days = max_age_days
+        self.max_count = max_count
+        self.interval = interval
+        self.tombstone_days = tombstone_days
+        self.batch_size = batch_size
+        self.lock_path = f'{store.path}.retention.lock'
+        self.evicted = 0
+        self.last_sweep = None
+        self._sweeper_pid = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return bool(self.max_age_days or self.max_count)
+
+    # Tek süpürme turu; başka bir worker süpürüyorsa hemen döner. Silinen doküman sayısını döndürür
+    def sweep(self):
+        with open(self.lock_path, 'w') as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return 0
+
+            started = time.time()
+            created_before = None
+            if self.max_age_days:
+                created_before = (datetime.utcfromtimestamp(started) - timedelta(days=self.max_age_days)).isoformat()
+
+            # Küçük parçalar halinde silinir; yazma kilidi uzun süre tutulmaz
+            evicted = 0
+            while True:
+                ids = self.store.evict(created_before, self.max_count, started, self.batch_size)
+                for req_id in ids:
+                    for key in self.render_keys(req_id):
+                        self.cache.discard(key)
+                evicted += len(ids)
+                if len(ids) < self.batch_size:
+                    break
+
+            # Süresi dolmuş dokümanların çıktıları da en az o kadar eskidir
+            if self.max_age_days:
+                self.cache.discard_older_than(started - self.max_age_days * 86400)
+            self.store.purge_tombstones(started - self.tombstone_days * 86400)
+            freed_pages = self.store.compact() if evicted else 0
+
+        with self._lock:
+            self.evicted += evicted
+            self.last_sweep = {
+                'at': datetime.utcfromtimestamp(started).isoformat(),
+                'evicted': evicted,
+                'freed_pages': freed_pages,
+                'seconds': round(time.time() - started, 3)
+            }
+        if evicted:
+            logger.info(f'Retention sweep evicted {evicted} requirements, freed {freed_pages} pages')
+        return evicted
+
+    def _run(self):
+        while True:
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.error(f'Retention sweep failed: {e}')
+            time.sleep(self.interval)
+
+    # Worker'ın ilk isteğinde arka plan thread'i başlatılır (fork öncesi master'da thread açılmaz)
+    def start(self):
+        if not self.enabled or self._sweeper_pid == os.getpid():
+            return
+        with self._lock:
+            if self._sweeper_pid != os.getpid():
+                threading.Thread(target=self._run, name='retention-sweeper', daemon=True).start()
+                self._sweeper_pid = os.getpid()
+
+    def stats(self):
+        return {
+            'enabled': self.enabled,
+            'max_age_days': self.max_age_days,
+            'max_count': self.max_count,
+            'evicted': self.evicted,
+            'last_sweep': self.last_sweep
+        }
@@ -0,0 +1,143 @@
+from array import array
+
+# Donanım hesaplamasında kullanılan alanlar (test ve canlı için cpu, ram, disk)
+COST_FIELDS = ('cpu_test', 'ram_test', 'disk_test', 'cpu_live', 'ram_live', 'disk_live')
+
+# Her modül/servis baz değerden düşülerek eklenir
+MODULE_OFFSETS = (2, 4, 10, 4, 8, 20)
+SERVICE_OFFSETS = (2, 4, 5, 4, 8, 10)
+
+# Başlangıç ve minimum değerler (test cpu/ram/disk, canlı cpu/ram/disk)
+BASE_REQUIREMENTS = (4, 8, 20, 8, 16, 40)
+
+# Katalogdaki bir kaynak değerinin üst sınırı; tüm modül/servislerin toplamı da C long'a sığmalıdır
+MAX_RESOURCE_VALUE = ((1 << (8 * array('l').itemsize - 1)) - 1) >> 16
+
+
+def _compile_vectors(catalog, offsets):
+    vectors = []
+    for info in catalog.values():
+        vectors.append(array('l', [int(info[field]) - offset for field, offset in zip(COST_FIELDS, offsets)]))
+    return vectors
+
+
+def _subset_sums(vectors):
+    # sums[mask] = mask içindeki vektörlerin toplamı; her maske bir öncekinden tek toplama ile bulunur
+    width = len(COST_FIELDS)
+    sums = [array('l', [0] * width)]
+    for mask in range(1, 1 << len(vectors)):
+        low = mask & -mask
+        previous = sums[mask ^ low]
+        vector = vectors[low.bit_length() - 1]
+        sums.append(array('l', [previous[i] + vector[i] for i in range(width)]))
+    return sums
+
+
+# MODULE_INFO/SERVICE_INFO'nun sayısal dizilere derlenmiş hali
+# Seçimler bitmask olarak ifade edilir; hesaplama vektör toplamına indirgenir
+class CompiledCatalog:
+    def __init__(self, modules, services, version=1):
+        self.version = version
+        self.module_ids = list(modules)
+        self.service_ids = list(services)
+        self.module_bits = {module_id: 1 << i for i, module_id in enumerate(self.module_ids)}
+        self.service_bits = {service_id: 1 << i for i, service_id in enumerate(self.service_ids)}
+        self.module_vectors = _compile_vectors(modules, MODULE_OFFSETS)
+        self.service_vectors = _compile_vectors(services, SERVICE_OFFSETS)
+        # GPU gerektirmeyen servisler için -1
+        self.service_gpu_ram = array('l', [
+            int(info.get('gpu_ram', 0)) if info.get('requires_gpu', False) else -1
+            for info in services.values()
+        ])
+        self._module_sums = None
+
+    def module_mask(self, module_ids):
+        mask = 0
+        for module_id in module_ids:
+            mask |= self.module_bits[module_id]
+        return mask
+
+    def service_mask(self, service_ids):
+        mask = 0
+        for service_id in service_ids:
+            mask |= self.service_bits[service_id]
+        return mask
+
+    def module_ids_for(self, mask):
+        return [module_id for module_id in self.module_ids if mask & self.module_bits[module_id]]
+
+    def service_ids_for(self, mask):
+        return [service_id for service_id in self.service_ids if mask & self.service_bits[service_id]]
+
+    @staticmethod
+    def _sum(vectors, mask):
+        total = [0] * len(COST_FIELDS)
+        i = 0
+        while mask:
+            if mask & 1:
+                vector = vectors[i]
+                for j in range(len(total)):
+                    total[j] += vector[j]
+            mask >>= 1
+            i += 1
+        return total
+
+    def _gpu_ram(self, service_mask):
+        gpu_ram = -1
+        i = 0
+        while service_mask:
+            if service_mask & 1:
+                gpu_ram = max(gpu_ram, self.service_gpu_ram[i])
+            service_mask >>= 1
+            i += 1
+        return gpu_ram
+
+    # Tüm modül kombinasyonlarının toplamları (ilk kullanımda bir kez hesaplanır)
+    def module_sums(self):
+        if self._module_sums is None:
+            self._module_sums = _subset_sums(self.module_vectors)
+        return self._module_sums
+
+    def _format(self, environment, totals, gpu_ram):
+        values = [max(total, base) for total, base in zip(totals, BASE_REQUIREMENTS)]
+        gpu = gpu_ram >= 0
+        test_requirements = {
+            'cpu': values[0],
+            'ram': values[1],
+            'disk': values[2],
+            'gpu': gpu,
+            'gpu_ram': max(gpu_ram, 0)
+        }
+        live_requirements = {
+            'cpu': values[3],
+            'ram': values[4],
+            'disk': values[5],
+            'gpu': gpu,
+            'gpu_ram': max(gpu_ram, 0)
+        }
+
+        # Seçilen ortama göre sonuçları filtrele
+        if environment == 'test':
+            return {'test': test_requirements}
+        elif environment == 'live':
+            return {'live': live_requirements}
+        else:  # Her ikisi
+            return {'test': test_requirements, 'live': live_requirements}
+
+    def requirements(self, environment, module_mask, service_mask):
+        module_totals = self._sum(self.module_vectors, module_mask)
+        service_totals = self._sum(self.service_vectors, service_mask)
+        totals = [base + m + s for base, m, s in zip(BASE_REQUIREMENTS, module_totals, service_totals)]
+        return self._format(environment, totals, self._gpu_ram(service_mask))
+
+    # Sabit servis seçimi için tüm modül kombinasyonlarını (2^n) değerlendir
+    def matrix(self, environment, service_mask=0):
+        service_totals = self._sum(self.service_vectors, service_mask)
+        offset = [base + s for base, s in zip(BASE_REQUIREMENTS, service_totals)]
+        gpu_ram = self._gpu_ram(service_mask)
+
+        rows = []
+        for mask, module_totals in enumerate(self.module_sums()):
+            totals = [o + m for o, m in zip(offset, module_totals)]
+            rows.append((mask, self._format(environment, totals, gpu_ram)))
+        return rows
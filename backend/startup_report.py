@@ -0,0 +1,44 @@
+import os
+import subprocess
+import sys
+
+# Backend bağımlılıklarının import maliyetini ölçer
+# Her modül ayrı bir interpreter'da soğuk olarak import edilir:
+#   python startup_report.py [modül ...]
+
+DEPENDENCIES = ('flask', 'flask_cors', 'jwt', 'requests', 'markdown', 'docx', 'weasyprint', 'app')
+
+MEASURE = (
+    'import time, resource\n'
+    'start = time.perf_counter()\n'
+    'import {module}\n'
+    'elapsed = time.perf_counter() - start\n'
+    'print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)\n'
+)
+
+
+def measure(module):
+    result = subprocess.run(
+        [sys.executable, '-c', MEASURE.format(module=module)],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        return None, None, result.stderr.strip().splitlines()[-1]
+    elapsed, max_rss = result.stdout.split()[-2:]
+    return float(elapsed), int(max_rss), None
+
+
+def main(modules):
+    print(f"{'Modül':<14}{'Süre (ms)':>12}{'Maks RSS (MB)':>16}")
+    for module in modules:
+        elapsed, max_rss, error = measure(module)
+        if error:
+            print(f"{module:<14}{'hata':>12}  {error}")
+        else:
+            print(f"{module:<14}{elapsed * 1000:>12.1f}{max_rss / 1024:>16.1f}")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:] or DEPENDENCIES)
@@ -0,0 +1,558 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# Gereksinim dokümanları için kalıcı depolama katmanı
+# SQLite (WAL) üzerine yazılır, sık erişilen dokümanlar bellekte id ile tutulur
+# Aynı dosya birden fazla worker process tarafından paylaşılır
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS requirements (
+    id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    environment TEXT,
+    environment_type TEXT,
+    database TEXT,
+    document TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_requirements_created_at ON requirements (created_at, id);
+CREATE INDEX IF NOT EXISTS idx_requirements_environment ON requirements (environment, created_at);
+CREATE INDEX IF NOT EXISTS idx_requirements_database ON requirements (database, created_at);
+CREATE INDEX IF NOT EXISTS idx_requirements_environment_type ON requirements (environment_type, created_at);
+
+-- Ters indeks: modül/servis -> doküman (en yeni önce sayfalama için created_at ile sıralı)
+CREATE TABLE IF NOT EXISTS requirement_tags (
+    kind TEXT NOT NULL,
+    item_id TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    requirement_id TEXT NOT NULL,
+    PRIMARY KEY (kind, item_id, created_at, requirement_id)
+) WITHOUT ROWID;
+
+-- İçerik özeti -> doküman (aynı yapılandırmanın tekrar kaydedilmemesi için)
+CREATE TABLE IF NOT EXISTS requirement_hashes (
+    content_hash TEXT PRIMARY KEY,
+    requirement_id TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_requirement_hashes_requirement_id ON requirement_hashes (requirement_id);
+
+-- İstemcinin gönderdiği Idempotency-Key -> ilk istekte oluşturulan doküman
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    key TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    requirement_id TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_idempotency_keys_created_at ON idempotency_keys (created_at);
+
+-- Saklama süresi dolup silinen dokümanlar (410 cevabı için)
+CREATE TABLE IF NOT EXISTS evicted_requirements (
+    id TEXT PRIMARY KEY,
+    evicted_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_evicted_requirements_evicted_at ON evicted_requirements (evicted_at);
+
+CREATE TABLE IF NOT EXISTS catalog_overrides (
+    kind TEXT NOT NULL,
+    item_id TEXT NOT NULL,
+    field TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (kind, item_id, field)
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS export_jobs (
+    id TEXT PRIMARY KEY,
+    requirement_id TEXT NOT NULL,
+    format TEXT NOT NULL,
+    cache_key TEXT NOT NULL,
+    status TEXT NOT NULL,
+    error TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_export_jobs_created_at ON export_jobs (created_at);
+
+CREATE TABLE IF NOT EXISTS revoked_tokens (
+    jti TEXT PRIMARY KEY,
+    expires_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS revoked_users (
+    email TEXT PRIMARY KEY,
+    revoked_before REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS rate_buckets (
+    key TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_rate_buckets_updated_at ON rate_buckets (updated_at);
+'''
+
+
+# SQLite bağlantı yönetimi
+class SQLiteStore:
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Yeni veritabanlarında silinen kayıtların sayfaları compact() ile geri verilebilir
+        # auto_vacuum yalnızca dosya oluşturulmadan önce ayarlanabilir; WAL'a geçiş dosyayı oluşturduğundan önce gelir
+        conn = sqlite3.connect(path, timeout=30)
+        try:
+            conn.execute('PRAGMA auto_vacuum=INCREMENTAL')
+            conn.execute('PRAGMA journal_mode=WAL')
+        finally:
+            conn.close()
+        self._connection().executescript(SCHEMA)
+
+    # Her thread kendi bağlantısını kullanır; fork sonrası bağlantılar yeniden açılır
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    # meta tablosundaki sürüm sayaçları (değişiklikleri diğer worker'lara duyurmak için)
+    def _version(self, key):
+        row = self._connection().execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return int(row[0]) if row else 1
+
+    # Transaction içinde çağrılır, yeni sürümü döndürür
+    @staticmethod
+    def _bump_version(conn, key):
+        conn.execute(
+            "INSERT INTO meta (key, value) VALUES (?, '2') "
+            "ON CONFLICT (key) DO UPDATE SET value = CAST(value AS INTEGER) + 1",
+            (key,)
+        )
+        return int(conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()[0])
+
+    # Boş sayfaları dosyaya geri ver ve WAL dosyasını küçült (istek yolunda çağrılmaz)
+    # Sayfalar küçük parçalar halinde bırakılır; araya giren yazma işlemleri uzun süre beklemez
+    # auto_vacuum öncesi oluşturulmuş veritabanları bir kez VACUUM ile incremental moda geçirilir
+    def compact(self, chunk_pages=256, pause=0.05):
+        conn = self._connection()
+        freed = conn.execute('PRAGMA freelist_count').fetchone()[0]
+        if freed:
+            if conn.execute('PRAGMA auto_vacuum').fetchone()[0] == 2:
+                while conn.execute('PRAGMA freelist_count').fetchone()[0]:
+                    conn.execute(f'PRAGMA incremental_vacuum({chunk_pages})').fetchall()
+                    time.sleep(pause)
+            else:
+                conn.execute('PRAGMA auto_vacuum=INCREMENTAL')
+                conn.execute('VACUUM')
+        conn.execute('PRAGMA wal_checkpoint(TRUNCATE)').fetchall()
+        return freed
+
+
+# Idempotency-Key daha önce farklı içerikli bir istek için kullanıldıysa fırlatılır
+class IdempotencyConflict(Exception):
+    pass
+
+
+# Doküman içindeki modül ve servislerin ters indekse yazılacak alanları
+TAG_FIELDS = (('module', 'core_modules'), ('service', 'auxiliary_services'))
+
+
+class RequirementStore(SQLiteStore):
+    def __init__(self, path, cache_size=1024, sync_interval=1.0):
+        super().__init__(path)
+        self.cache_size = cache_size
+        self.sync_interval = sync_interval
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._eviction_version = self._version('eviction_version')
+        self._synced_at = time.monotonic()
+        self._backfill_tags()
+
+    # Ters indeksten önce kaydedilmiş dokümanları indekse ekle
+    def _backfill_tags(self):
+        conn = self._connection()
+        if conn.execute('SELECT EXISTS (SELECT 1 FROM requirement_tags)').fetchone()[0]:
+            return
+        with conn:
+            for kind, field in TAG_FIELDS:
+                conn.execute(
+                    'INSERT OR IGNORE INTO requirement_tags (kind, item_id, created_at, requirement_id) '
+                    f"SELECT ?, json_extract(item.value, '$.id'), r.created_at, r.id "
+                    f"FROM requirements r, json_each(r.document, '$.{field}') item",
+                    (kind,)
+                )
+
+    def _remember(self, requirement):
+        with self._lock:
+            self._cache[requirement['id']] = requirement
+            self._cache.move_to_end(requirement['id'])
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    @staticmethod
+    def _row(requirement):
+        return (
+            requirement['id'],
+            requirement['created_at'],
+            requirement.get('environment'),
+            requirement.get('environment_type'),
+            requirement.get('database'),
+            json.dumps(requirement, ensure_ascii=False)
+        )
+
+    # Yeni dokümanı kaydet (write-through)
+    def add(self, requirement):
+        return self.add_many([requirement])[0]
+
+    # Aynı modül/servis birden fazla seçilmişse tek etiket yazılır
+    @staticmethod
+    def _tags(requirement):
+        return list(dict.fromkeys(
+            (kind, item['id'], requirement['created_at'], requirement['id'])
+            for kind, field in TAG_FIELDS
+            for item in requirement.get(field, [])
+        ))
+
+    def _insert(self, conn, requirements):
+        conn.executemany(
+            'INSERT INTO requirements (id, created_at, environment, environment_type, database, document) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            [self._row(requirement) for requirement in requirements]
+        )
+        conn.executemany(
+            'INSERT INTO requirement_tags (kind, item_id, created_at, requirement_id) VALUES (?, ?, ?, ?)',
+            [tag for requirement in requirements for tag in self._tags(requirement)]
+        )
+
+    # Birden fazla dokümanı tek transaction içinde kaydet
+    def add_many(self, requirements):
+        conn = self._connection()
+        with conn:
+            self._insert(conn, requirements)
+        for requirement in requirements:
+            self._remember(requirement)
+        return requirements
+
+    # Aynı içerikli doküman (veya aynı Idempotency-Key ile oluşturulan doküman) varsa onu,
+    # yoksa yeni dokümanı kaydedip döndürür: (doküman, yeni mi, anahtar tekrarı mı)
+    # Kontrol ve kayıt tek yazma transaction'ında yapılır; eşzamanlı aynı istekler tek kayıt oluşturur
+    def add_unique(self, requirement, content_hash, idempotency_key=None, now=0.0, key_ttl=86400, dedup=True):
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            existing_id = None
+            replayed = False
+            if idempotency_key is not None:
+                conn.execute('DELETE FROM idempotency_keys WHERE created_at < ?', (now - key_ttl,))
+                row = conn.execute(
+                    'SELECT k.content_hash, k.requirement_id, r.document FROM idempotency_keys k '
+                    'JOIN requirements r ON r.id = k.requirement_id WHERE k.key = ?',
+                    (idempotency_key,)
+                ).fetchone()
+                if row is not None:
+                    if row[0] != content_hash:
+                        raise IdempotencyConflict(idempotency_key)
+                    existing_id, existing, replayed = row[1], row[2], True
+
+            if existing_id is None and dedup:
+                row = conn.execute(
+                    'SELECT h.requirement_id, r.document FROM requirement_hashes h '
+                    'JOIN requirements r ON r.id = h.requirement_id WHERE h.content_hash = ?',
+                    (content_hash,)
+                ).fetchone()
+                if row is not None:
+                    existing_id, existing = row
+
+            if existing_id is None:
+                self._insert(conn, [requirement])
+                conn.execute(
+                    'INSERT OR REPLACE INTO requirement_hashes (content_hash, requirement_id) VALUES (?, ?)',
+                    (content_hash, requirement['id'])
+                )
+            if idempotency_key is not None and not replayed:
+                conn.execute(
+                    'INSERT OR REPLACE INTO idempotency_keys (key, content_hash, requirement_id, created_at) '
+                    'VALUES (?, ?, ?, ?)',
+                    (idempotency_key, content_hash, existing_id or requirement['id'], now)
+                )
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+        if existing_id is None:
+            self._remember(requirement)
+            return requirement, True, False
+        existing = json.loads(existing)
+        self._remember(existing)
+        return existing, False, replayed
+
+    # Başka bir worker doküman sildiyse bellekteki kopyalar bırakılır
+    def _sync_evictions(self):
+        now = time.monotonic()
+        if now - self._synced_at < self.sync_interval:
+            return
+        self._synced_at = now
+        version = self._version('eviction_version')
+        if version != self._eviction_version:
+            with self._lock:
+                self._cache.clear()
+            self._eviction_version = version
+
+    # Dokümanı id ile getir, yoksa None döndür
+    def get(self, req_id):
+        self._sync_evictions()
+        with self._lock:
+            requirement = self._cache.get(req_id)
+            if requirement is not None:
+                self._cache.move_to_end(req_id)
+                return requirement
+
+        row = self._connection().execute(
+            'SELECT document FROM requirements WHERE id = ?', (req_id,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        requirement = json.loads(row[0])
+        self._remember(requirement)
+        return requirement
+
+    # İkincil indeksler üzerinden filtreleme (en yeni dokümanlar önce)
+    # Modül/servis filtresi varsa sorgu ters indeksten başlar
+    # before: önceki sayfanın son kaydının (created_at, id) değeri (keyset sayfalama)
+    def find(self, environment=None, environment_type=None, database=None, module=None, service=None,
+             created_after=None, created_before=None, before=None, limit=100):
+        clauses = []
+        params = []
+        tags = [(kind, item_id) for kind, item_id in (('module', module), ('service', service)) if item_id]
+
+        if tags:
+            query = 'SELECT r.document FROM requirement_tags t JOIN requirements r ON r.id = t.requirement_id'
+            created_at, row_id = 't.created_at', 't.requirement_id'
+            clauses += ['t.kind = ?', 't.item_id = ?']
+            params += tags[0]
+            for kind, item_id in tags[1:]:
+                clauses.append(
+                    'EXISTS (SELECT 1 FROM requirement_tags s WHERE s.kind = ? AND s.item_id = ? '
+                    'AND s.created_at = r.created_at AND s.requirement_id = r.id)'
+                )
+                params += [kind, item_id]
+        else:
+            query = 'SELECT r.document FROM requirements r'
+            created_at, row_id = 'r.created_at', 'r.id'
+
+        for column, value in (('r.environment', environment), ('r.environment_type', environment_type),
+                              ('r.database', database)):
+            if value:
+                clauses.append(f'{column} = ?')
+                params.append(value)
+        if created_after:
+            clauses.append(f'{created_at} >= ?')
+            params.append(created_after)
+        if created_before:
+            clauses.append(f'{created_at} < ?')
+            params.append(created_before)
+        if before:
+            clauses.append(f'({created_at}, {row_id}) < (?, ?)')
+            params += before
+
+        if clauses:
+            query += ' WHERE ' + ' AND '.join(clauses)
+        query += f' ORDER BY {created_at} DESC, {row_id} DESC LIMIT ?'
+        params.append(limit)
+
+        return [json.loads(row[0]) for row in self._connection().execute(query, params)]
+
+    def count(self):
+        return self._connection().execute('SELECT COUNT(*) FROM requirements').fetchone()[0]
+
+    # Saklama politikası: created_before'dan eski veya en yeni max_count dokümanın dışında kalan
+    # en fazla limit dokümanı sil (en eskiden başlayarak), silinen id'leri döndür
+    # Silinen id'ler için iz bırakılır (is_evicted); diğer worker'lar sürüm değişikliğiyle cache'lerini bırakır
+    def evict(self, created_before=None, max_count=0, now=0.0, limit=500):
+        conn = self._connection()
+        rows = []
+        if created_before:
+            rows = conn.execute(
+                'SELECT id, document FROM requirements WHERE created_at < ? ORDER BY created_at, id LIMIT ?',
+                (created_before, limit)
+            ).fetchall()
+        if not rows and max_count:
+            excess = self.count() - max_count
+            if excess > 0:
+                rows = conn.execute(
+                    'SELECT id, document FROM requirements ORDER BY created_at, id LIMIT ?',
+                    (min(excess, limit),)
+                ).fetchall()
+        if not rows:
+            return []
+
+        ids = [req_id for req_id, _ in rows]
+        tags = [tag for _, document in rows for tag in self._tags(json.loads(document))]
+        with conn:
+            conn.executemany(
+                'DELETE FROM requirement_tags WHERE kind = ? AND item_id = ? AND created_at = ? AND requirement_id = ?',
+                tags
+            )
+            conn.executemany('DELETE FROM requirements WHERE id = ?', [(req_id,) for req_id in ids])
+            conn.executemany('DELETE FROM requirement_hashes WHERE requirement_id = ?', [(req_id,) for req_id in ids])
+            conn.executemany(
+                'INSERT OR REPLACE INTO evicted_requirements (id, evicted_at) VALUES (?, ?)',
+                [(req_id, now) for req_id in ids]
+            )
+            self._eviction_version = self._bump_version(conn, 'eviction_version')
+        with self._lock:
+            for req_id in ids:
+                self._cache.pop(req_id, None)
+        return ids
+
+    def is_evicted(self, req_id):
+        return self._connection().execute(
+            'SELECT EXISTS (SELECT 1 FROM evicted_requirements WHERE id = ?)', (req_id,)
+        ).fetchone()[0] == 1
+
+    # Eski silme izlerini temizle (bu tarihten sonra silinmiş id'ler için 404 döner)
+    def purge_tombstones(self, before):
+        conn = self._connection()
+        with conn:
+            conn.execute('DELETE FROM evicted_requirements WHERE evicted_at < ?', (before,))
+
+
+# Admin tarafından yapılan katalog değişiklikleri
+# Her worker sürüm numarasını kontrol ederek değişiklikleri kendi belleğine alır
+class CatalogStore(SQLiteStore):
+    def version(self):
+        return self._version('catalog_version')
+
+    # Değişiklikleri kaydet ve yeni sürüm numarasını döndür
+    def save_overrides(self, kind, item_id, fields):
+        conn = self._connection()
+        with conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO catalog_overrides (kind, item_id, field, value) VALUES (?, ?, ?, ?)',
+                [(kind, item_id, field, json.dumps(value, ensure_ascii=False)) for field, value in fields.items()]
+            )
+            return self._bump_version(conn, 'catalog_version')
+
+    # (sürüm, değişiklikler) aynı okuma transaction'ında alınır
+    def load(self):
+        conn = self._connection()
+        conn.execute('BEGIN')
+        try:
+            return self.version(), self.overrides()
+        finally:
+            conn.execute('COMMIT')
+
+    # {kind: {item_id: {field: value}}}
+    def overrides(self):
+        result = {}
+        for kind, item_id, field, value in self._connection().execute(
+            'SELECT kind, item_id, field, value FROM catalog_overrides'
+        ):
+            result.setdefault(kind, {}).setdefault(item_id, {})[field] = json.loads(value)
+        return result
+
+
+# Export işlerinin durumu (tüm worker'lar tarafından görülebilir)
+class ExportJobStore(SQLiteStore):
+    COLUMNS = ('id', 'requirement_id', 'format', 'cache_key', 'status', 'error', 'created_at')
+
+    def add(self, job):
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                'INSERT INTO export_jobs (id, requirement_id, format, cache_key, status, error, created_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                tuple(job[column] for column in self.COLUMNS)
+            )
+
+    def update(self, job_id, status, error=None):
+        conn = self._connection()
+        with conn:
+            conn.execute('UPDATE export_jobs SET status = ?, error = ? WHERE id = ?', (status, error, job_id))
+
+    def get(self, job_id):
+        row = self._connection().execute(
+            f"SELECT {', '.join(self.COLUMNS)} FROM export_jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        return dict(zip(self.COLUMNS, row)) if row else None
+
+    # Belirli bir zamandan eski işleri sil
+    def prune(self, before):
+        conn = self._connection()
+        with conn:
+            conn.execute('DELETE FROM export_jobs WHERE created_at < ?', (before,))
+
+
+# İptal edilen token'lar (çıkış) ve kullanıcı bazında toplu iptaller (rol değişikliği)
+class RevocationStore(SQLiteStore):
+    def version(self):
+        return self._version('revocation_version')
+
+    # Token süresi dolana kadar iptal listesinde tutulur
+    def revoke_token(self, jti, expires_at, now):
+        conn = self._connection()
+        with conn:
+            conn.execute('DELETE FROM revoked_tokens WHERE expires_at < ?', (now,))
+            conn.execute('INSERT OR REPLACE INTO revoked_tokens (jti, expires_at) VALUES (?, ?)', (jti, expires_at))
+            return self._bump_version(conn, 'revocation_version')
+
+    # Kullanıcının bu zamandan önce alınmış tüm token'larını iptal et
+    def revoke_user(self, email, before):
+        conn = self._connection()
+        with conn:
+            conn.execute('INSERT OR REPLACE INTO revoked_users (email, revoked_before) VALUES (?, ?)', (email, before))
+            return self._bump_version(conn, 'revocation_version')
+
+    # ({jti: expires_at}, {email: revoked_before})
+    def load(self, now):
+        conn = self._connection()
+        tokens = dict(conn.execute('SELECT jti, expires_at FROM revoked_tokens WHERE expires_at >= ?', (now,)))
+        users = dict(conn.execute('SELECT email, revoked_before FROM revoked_users'))
+        return tokens, users
+
+
+# Worker'lar arası paylaşılan hız limiti bucket'ları (admission.MemoryBucketBackend ile aynı arayüz)
+class RateLimitStore(SQLiteStore):
+    # Bucket'tan cost kadar token al; yeterli token yoksa beklenmesi gereken süreyi döndür
+    def take(self, key, rate, burst, now, cost=1):
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute('SELECT tokens, updated_at FROM rate_buckets WHERE key = ?', (key,)).fetchone()
+            tokens, updated_at = row if row else (burst, now)
+            tokens = min(burst, tokens + max(0.0, now - updated_at) * rate)
+            wait = 0.0
+            if tokens >= cost:
+                tokens -= cost
+            else:
+                wait = (cost - tokens) / rate
+            conn.execute(
+                'INSERT OR REPLACE INTO rate_buckets (key, tokens, updated_at) VALUES (?, ?, ?)',
+                (key, tokens, max(now, updated_at))
+            )
+            conn.execute('COMMIT')
+            return wait
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+    # before'dan beri kullanılmayan bucket'ları sil
+    def prune(self, before):
+        conn = self._connection()
+        with conn:
+            conn.execute('DELETE FROM rate_buckets WHERE updated_at < ?', (before,))
@@ -0,0 +1,29 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from storage import RequirementStore
+
+
+class SQLiteStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'requirements.db')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    # Yeni veritabanı incremental auto_vacuum ve WAL ile oluşturulmalı (compact() tam VACUUM'a düşmesin)
+    def test_new_database_uses_incremental_auto_vacuum(self):
+        RequirementStore(self.path)
+        conn = sqlite3.connect(self.path)
+        try:
+            self.assertEqual(conn.execute('PRAGMA auto_vacuum').fetchone()[0], 2)
+            self.assertEqual(conn.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+        finally:
+            conn.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import hashlib
+import threading
+import time
+import jwt
+from cache import LRUCache
+
+
+# Token reddedildiğinde nedeniyle birlikte fırlatılır
+class TokenRejected(Exception):
+    def __init__(self, reason):
+        super().__init__(reason)
+        self.reason = reason
+
+
+# JWT doğrulama katmanı
+# Doğrulanmış token'lar özetleriyle, süreleri dolana kadar bellekte tutulur; aynı token
+# ile gelen isteklerde imza tekrar hesaplanmaz. İptal listesi paylaşılan depodan
+# sync_interval saniyede bir (sürüm değiştiyse) yeniden okunur.
+class TokenVerifier:
+    FAILURE_REASONS = ('missing', 'malformed', 'bad_signature', 'expired', 'invalid_claims', 'revoked')
+
+    def __init__(self, store, max_size=1024, sync_interval=1.0):
+        self.store = store
+        self.sync_interval = sync_interval
+        self.cache = LRUCache(max_size)
+        self.failures = dict.fromkeys(self.FAILURE_REASONS, 0)
+        self._revoked_tokens = {}
+        self._revoked_users = {}
+        self._version = None
+        self._synced_at = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _digest(token, secret):
+        return hashlib.sha256(f'{secret}.{token}'.encode('utf-8')).hexdigest()
+
+    def _reject(self, reason):
+        with self._lock:
+            self.failures[reason] += 1
+        raise TokenRejected(reason)
+
+    # İptal listesini depodaki sürüm değiştiyse yeniden yükle
+    def sync(self, force=False):
+        now = time.time()
+        if not force and now - self._synced_at < self.sync_interval:
+            return
+        self._synced_at = now
+        version = self.store.version()
+        if version != self._version:
+            tokens, users = self.store.load(now)
+            with self._lock:
+                self._revoked_tokens = tokens
+                self._revoked_users = users
+                self._version = version
+
+    def _is_revoked(self, claims):
+        if claims.get('jti') in self._revoked_tokens:
+            return True
+        revoked_before = self._revoked_users.get(claims['email'])
+        return revoked_before is not None and claims.get('iat', 0) < revoked_before
+
+    # Token'ı doğrula, {'email', 'role'} döndür
+    def verify(self, token, secret):
+        if not token:
+            self._reject('missing')
+
+        self.sync()
+        key = self._digest(token, secret)
+        claims = self.cache.get(key)
+
+        if claims is None:
+            try:
+                claims = jwt.decode(token, secret, algorithms=['HS256'])
+            except jwt.ExpiredSignatureError:
+                self._reject('expired')
+            except jwt.InvalidSignatureError:
+                self._reject('bad_signature')
+            except jwt.DecodeError:
+                self._reject('malformed')
+            except jwt.InvalidTokenError:
+                self._reject('invalid_claims')
+
+            if not isinstance(claims.get('email'), str) or not isinstance(claims.get('role'), str) or 'exp' not in claims:
+                self._reject('invalid_claims')
+            self.cache.set(key, claims)
+        elif claims['exp'] <= time.time():
+            self._reject('expired')
+
+        if self._is_revoked(claims):
+            self._reject('revoked')
+
+        return {'email': claims['email'], 'role': claims['role']}
+
+    # Tek bir token'ı iptal et (çıkış)
+    def revoke_token(self, token, secret):
+        claims = jwt.decode(token, secret, algorithms=['HS256'])
+        if 'jti' in claims:
+            self.store.revoke_token(claims['jti'], claims['exp'], time.time())
+        else:
+            # Eski token'larda jti yok; kullanıcının mevcut token'ları iptal edilir
+            self.store.revoke_user(claims['email'], time.time())
+        self.sync(force=True)
+
+    # Kullanıcının şu ana kadar aldığı tüm token'ları iptal et (rol değişikliği vb.)
+    def revoke_user(self, email):
+        self.store.revoke_user(email, time.time())
+        self.sync(force=True)
+
+    def stats(self):
+        with self._lock:
+            failures = dict(self.failures)
+            revoked = {'tokens': len(self._revoked_tokens), 'users': len(self._revoked_users)}
+        return {'cache': self.cache.stats(), 'failures': failures, 'revoked': revoked}
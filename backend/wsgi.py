@@ -0,0 +1,3 @@
+# Production giriş noktası: gunicorn -c gunicorn.conf.py wsgi:app
+# app.py uygulamayı import sırasında oluşturur; ikinci bir örnek oluşturulmaz
+from app import app
@@ -138,9 +138,94 @@ document.addEventListener('DOMContentLoaded', function() {
         messageElement.textContent = message;
         chatMessages.appendChild(messageElement);
         chatMessages.scrollTop = chatMessages.scrollHeight;
+        return messageElement;
     }
 
     function processChatbotResponse(userMessage) {
+        // Cevabı SSE olarak stream ediyoruz, tarayıcı desteklemiyorsa tek seferde alıyoruz
+        if (!window.ReadableStream || !window.TextDecoder) {
+            fetchChatbotResponse(userMessage);
+            return;
+        }
+
+        let streamStarted = false;
+
+        fetch('/api/chatbot/stream', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({ message: userMessage })
+        })
+        .then(response => {
+            if (!response.ok || !response.body) {
+                throw new Error(`Stream failed with status ${response.status}`);
+            }
+            streamStarted = true;
+            return readChatbotStream(response.body.getReader());
+        })
+        .catch(error => {
+            console.error('Error:', error);
+            if (streamStarted) {
+                addBotMessage("Bağlantı hatası oluştu. Lütfen daha sonra tekrar deneyin.");
+            } else {
+                fetchChatbotResponse(userMessage);
+            }
+        });
+    }
+
+    function readChatbotStream(reader) {
+        const decoder = new TextDecoder();
+        let messageElement = null;
+        let buffer = '';
+
+        function handleEvent(rawEvent) {
+            let eventName = 'message';
+            let data = '';
+            rawEvent.split('\n').forEach(line => {
+                if (line.startsWith('event:')) {
+                    eventName = line.slice(6).trim();
+                } else if (line.startsWith('data:')) {
+                    data += line.slice(5).trim();
+                }
+            });
+            if (!data) {
+                return;
+            }
+
+            const payload = JSON.parse(data);
+            if (eventName === 'error') {
+                addBotMessage(payload.message);
+            } else if (payload.delta) {
+                // İlk parça geldiğinde mesaj balonunu oluştur, sonrakileri ekle
+                if (!messageElement) {
+                    messageElement = addBotMessage('');
+                }
+                messageElement.textContent += payload.delta;
+                chatMessages.scrollTop = chatMessages.scrollHeight;
+            }
+        }
+
+        function read() {
+            return reader.read().then(({ done, value }) => {
+                if (done) {
+                    if (buffer.trim()) {
+                        handleEvent(buffer);
+                    }
+                    return;
+                }
+                buffer += decoder.decode(value, { stream: true });
+                const events = buffer.split('\n\n');
+                buffer = events.pop();
+                events.forEach(handleEvent);
+                return read();
+            });
+        }
+
+        return read();
+    }
+
+    function fetchChatbotResponse(userMessage) {
         // Kullanıcının mesajını API'ye gönderiyoruz (webhook entegrasyonu)
         fetch('/api/chatbot/message', {
             method: 'POST',